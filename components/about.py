@@ -1,6 +1,9 @@
 from fasthtml.common import *
 from data.content import about_content
+from components.images import ResponsiveImg
+from services.fragment_cache import fragment
 
+@fragment
 def About():
     """About section with personal story."""
     return ft_hx('section',
@@ -38,7 +41,7 @@ def About():
                 # Image
                 Div(
                     Div(
-                        Img(src=about_content['image'], alt='Foto personal', loading='lazy') if about_content.get('image') else Div(cls='about-image-placeholder'),
+                        ResponsiveImg(about_content['image'], alt='Foto personal', sizes='(max-width: 900px) 100vw, 40vw') if about_content.get('image') else Div(cls='about-image-placeholder'),
                         cls='about-image-wrapper'
                     ),
                     cls='about-image-container'
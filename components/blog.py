@@ -1,5 +1,15 @@
 from fasthtml.common import *  # pyright: ignore[reportMissingImports]
 from data.blog_loader import get_all_posts
+from data.content_store import facet_key
+from services.i18n import t
+
+def TagLink(tag):
+    """Tag chip linking to the tag's post listing."""
+    return A(tag, href=f'/blog/tag/{facet_key(tag)}', cls='blog-tag')
+
+def CategoryLink(category):
+    """Link to the category's post listing."""
+    return A(category, href=f'/blog/category/{facet_key(category)}', cls='blog-category')
 
 def BlogSection():
     """Blog section with recent posts preview."""
@@ -49,7 +59,7 @@ def BlogCard(post, idx):
 
         # Tags
         Div(
-            *[Span(tag, cls='blog-tag') for tag in post.get('tags', [])[:3]],
+            *[TagLink(tag) for tag in post.get('tags', [])[:3]],
             cls='blog-card-tags'
         ),
 
@@ -68,6 +78,34 @@ def BlogCard(post, idx):
            'style': f'--delay: {idx * 100}ms'}
     )
 
+def TocList(entries):
+    """Nested list of heading links from a compiled table of contents."""
+    return Ol(
+        *[Li(
+            A(NotStr(entry['name']), href=f"#{entry['id']}"),
+            TocList(entry['children']) if entry['children'] else None
+        ) for entry in entries],
+        cls='toc-list'
+    )
+
+def TableOfContents(toc):
+    """Post table of contents sidebar (None for posts with fewer than two headings)."""
+    if sum(1 for _ in _walk(toc)) < 2:
+        return None
+    return Aside(
+        Nav(
+            Span(t('toc.title'), cls='toc-title'),
+            TocList(toc),
+            aria_label=t('toc.label')
+        ),
+        cls='post-toc'
+    )
+
+def _walk(entries):
+    for entry in entries:
+        yield entry
+        yield from _walk(entry['children'])
+
 def BlogListCard(post):
     """Blog post card for blog list page."""
     return Article(
@@ -76,7 +114,8 @@ def BlogListCard(post):
             Div(
                 Time(post['date'], datetime=post['date']),
                 Span('·', cls='separator'),
-                Span('5 min', cls='reading-time'),
+                Span(f"{post['reading_time']} min", cls='reading-time'),
+                *([Span('·', cls='separator'), CategoryLink(post['category'])] if post.get('category') else []),
                 cls='blog-list-meta'
             ),
 
@@ -91,7 +130,7 @@ def BlogListCard(post):
 
             # Tags
             Div(
-                *[Span(tag, cls='blog-tag') for tag in post.get('tags', [])],
+                *[TagLink(tag) for tag in post.get('tags', [])],
                 cls='blog-list-tags'
             ),
 
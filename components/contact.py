@@ -1,6 +1,8 @@
 from fasthtml.common import *
 from data.content import site_config
+from services.fragment_cache import fragment
 
+@fragment
 def Contact():
     """Contact section with form."""
     return ft_hx('section',
@@ -60,6 +62,14 @@ def Contact():
                             cls='form-group'
                         ),
 
+                        # Honeypot: off-screen, left empty by people (see services/spam.py)
+                        Div(
+                            Label('Website', fr='website'),
+                            Input(type='text', id='website', name='website', tabindex='-1', autocomplete='off'),
+                            cls='form-honeypot',
+                            aria_hidden='true'
+                        ),
+
                         # Submit button
                         Button(
                             'Enviar mensaje',
@@ -74,6 +84,8 @@ def Contact():
                         hx_post='/contact',
                         hx_target='#contact-form-response',
                         hx_swap='innerHTML',
+                        # Time since page load, for the minimum fill time check
+                        hx_vals='js:{elapsed: Math.round(performance.now())}',
                         cls='contact-form',
                         **{'x-data': '{ sending: false }',
                            '@submit': 'sending = true',
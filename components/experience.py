@@ -1,6 +1,8 @@
 from fasthtml.common import *
 from data.content import experience_data
+from services.fragment_cache import fragment
 
+@fragment
 def Experience():
     """Experience/Work history section with timeline."""
     return ft_hx('section',
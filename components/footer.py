@@ -1,7 +1,9 @@
 from fasthtml.common import *
 from data.content import site_config, footer_links
 import datetime
+from services.fragment_cache import fragment
 
+@fragment(key=lambda: datetime.datetime.now().year)
 def Footer():
     """Site footer with links and credits."""
     current_year = datetime.datetime.now().year
@@ -1,7 +1,9 @@
 from fasthtml.common import *
 from data.content import hero_content, site_config
 from services.i18n import t
+from services.fragment_cache import fragment
 
+@fragment
 def Hero():
     """Hero section with animated introduction."""
     return ft_hx('section',
@@ -0,0 +1,30 @@
+from fasthtml.common import *
+from services.assets import asset_url
+from services.images import image_info
+
+def _srcset(variants):
+    return ', '.join(f'{asset_url(path)} {width}w' for width, path in variants)
+
+def ResponsiveImg(src, alt, sizes='100vw', **attrs):
+    """Image with AVIF/WebP sources, srcset and intrinsic size from the image manifest.
+
+    Falls back to a plain Img when the image has no built variants.
+
+    Args:
+        src: Static URL of the source image ('/static/images/about.jpg')
+        alt: Alternative text
+        sizes: Rendered width per breakpoint (`sizes` attribute)
+        **attrs: Extra attributes for the <img> (loading, cls, ...)
+    """
+    attrs.setdefault('loading', 'lazy')
+    info = image_info(src)
+    if info is None:
+        return Img(src=asset_url(src), alt=alt, **attrs)
+
+    variants = info['variants']
+    return Picture(
+        *[Source(type=f'image/{fmt}', srcset=_srcset(variants[fmt]), sizes=sizes)
+          for fmt in ('avif', 'webp') if variants.get(fmt)],
+        Img(src=asset_url(src), srcset=_srcset(variants['fallback']), sizes=sizes,
+            width=info['width'], height=info['height'], alt=alt, decoding='async', **attrs),
+    )
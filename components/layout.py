@@ -1,13 +1,17 @@
 from fasthtml.common import *
 from data.content import site_config
 from services.i18n import t, get_language
+from services.assets import asset_url
+from services.critical_css import critical_css, stylesheet_built, FULL_STYLESHEET, SOURCE_STYLESHEETS
+from services.fragment_cache import fragment
 
-def Page(*children, title=None):
+def Page(*children, title=None, page_type='page'):
     """Main page wrapper with HTML structure.
 
     Args:
         *children: Page content components
         title: Page title
+        page_type: Layout family ('home', 'post', ...) that selects the inlined critical CSS
     """
     lang = get_language()
 
@@ -17,24 +21,42 @@ def Page(*children, title=None):
             Meta(charset='utf-8'),
             Meta(name='viewport', content='width=device-width, initial-scale=1'),
             Meta(name='description', content=site_config['description']),
+            Link(rel='alternate', type='application/atom+xml', href=f'/feed.xml?lang={lang}', title=f"Blog | {site_config['name']}"),
             # Google Fonts - Geometric Bold Theme
             Link(rel='preconnect', href='https://fonts.googleapis.com'),
             Link(rel='preconnect', href='https://fonts.gstatic.com', crossorigin=True),
             Link(rel='stylesheet', href='https://fonts.googleapis.com/css2?family=Outfit:wght@400;500;600;700;800&family=Space+Grotesk:wght@400;500;600;700&family=JetBrains+Mono:wght@400;500;600&display=swap'),
             # CSS
-            Link(rel='stylesheet', href='/static/css/main.css'),
-            Link(rel='stylesheet', href='/static/css/theme-geometric.css'),
+            *Stylesheets(page_type),
             # Alpine.js
             Script(src='https://unpkg.com/alpinejs@3.x.x/dist/cdn.min.js', defer=True),
         ),
         Body(
             *children,
-            cls='page'
+            cls='page',
+            data_page=page_type
         ),
         lang=lang,
         **{'data-theme': 'geometric'}
     )
 
+def Stylesheets(page_type='page'):
+    """Inline the page type's critical CSS and load the rest async, or link the stylesheets."""
+    if not stylesheet_built():
+        return [Link(rel='stylesheet', href=asset_url(f'css/{name}')) for name in SOURCE_STYLESHEETS]
+
+    href = asset_url(f'css/{FULL_STYLESHEET}')
+    critical = critical_css(page_type)
+    if critical is None:
+        # No critical CSS built for this page type
+        return [Link(rel='stylesheet', href=href)]
+    return [
+        Style(NotStr(critical)),
+        Link(rel='preload', href=href, **{'as': 'style', 'onload': "this.onload=null;this.rel='stylesheet'"}),
+        Noscript(Link(rel='stylesheet', href=href)),
+    ]
+
+@fragment
 def Navbar():
     """Fixed navigation bar with smooth scroll links."""
     lang = get_language()
@@ -1,6 +1,12 @@
 from fasthtml.common import *
 from data.project_loader import get_all_projects, get_featured_projects
 from services.i18n import t
+from components.images import ResponsiveImg
+from data.content_store import facet_key
+
+def TechLink(tech):
+    """Technology chip linking to the projects that use it."""
+    return A(tech, href=f'/projects/tech/{facet_key(tech)}', cls='tech-tag')
 
 def Projects():
     """Projects showcase section."""
@@ -47,7 +53,7 @@ def FeaturedProject(project, idx):
         # Project image
         Div(
             Div(
-                Img(src=project['image'], alt=project['title'], loading='lazy') if project.get('image') else '',
+                ResponsiveImg(project['image'], alt=project['title'], sizes='(max-width: 900px) 100vw, 50vw') if project.get('image') else '',
                 Div(cls='project-image-overlay'),
                 cls='project-image-wrapper'
             ),
@@ -65,7 +71,7 @@ def FeaturedProject(project, idx):
 
             # Technologies
             Div(
-                *[Span(tech, cls='tech-tag') for tech in project['technologies']],
+                *[TechLink(tech) for tech in project['technologies']],
                 cls='project-tech'
             ),
 
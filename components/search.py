@@ -0,0 +1,49 @@
+from fasthtml.common import *
+from services.i18n import t
+
+def SearchBox(query='', results=''):
+    """Search input with live results (HTMX), falling back to a plain GET form.
+
+    Args:
+        query: Initial value of the input
+        results: Initial content of the results container
+    """
+    return Div(
+        Form(
+            Input(
+                type='search',
+                name='q',
+                value=query,
+                placeholder=t('search.placeholder'),
+                autocomplete='off',
+                aria_label=t('search.title'),
+                cls='form-input search-input',
+                hx_get='/search',
+                hx_trigger='input changed delay:200ms, search',
+                hx_target='#search-results'
+            ),
+            action='/search',
+            method='get',
+            role='search',
+            cls='search-form'
+        ),
+        Div(results, id='search-results', cls='search-results', aria_live='polite'),
+        cls='search-box'
+    )
+
+def SearchResults(query, results):
+    """Result list for a query (empty query renders nothing)."""
+    if not query.strip():
+        return ''
+    if not results:
+        return P(t('search.no_results', query=query), cls='search-empty')
+
+    return Ul(
+        *[Li(
+            A(doc['title'], href=doc['url'], cls='search-result-title'),
+            Span(t(f"search.{doc['kind']}"), cls='search-result-kind'),
+            P(doc['excerpt'], cls='search-result-excerpt') if doc['excerpt'] else '',
+            cls='search-result'
+        ) for _, doc in results],
+        cls='search-results-list'
+    )
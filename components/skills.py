@@ -1,6 +1,8 @@
 from fasthtml.common import *
 from data.content import skills_data
+from services.fragment_cache import fragment
 
+@fragment
 def Skills():
     """Skills section with categorized tech stack."""
     categories = [
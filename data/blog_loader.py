@@ -24,60 +24,46 @@ category: FastHTML         # Optional: defaults to folder name
 ---
 
 # Post content here in Markdown...
+
+Settings (.env):
+    BLOG_PAGE_SIZE=10   # Posts per /blog page (0 lists every post)
 """
 
-import re
-import frontmatter
-import markdown
+import os
 from pathlib import Path
-from typing import List, Dict, Optional
-from functools import lru_cache
-from textwrap import dedent
+from typing import List, Dict, Optional, Tuple
+
+from data import content_cache
+from data.compiler import read_document
+from data.rendering import RENDERER_CONFIG, render_snippet, text_stats
+from data.content_store import ContentIndex, ContentStore
 
 # Base content path
 CONTENT_DIR = Path(__file__).resolve().parent.parent / 'content'
 
+# Posts per listing page (0 disables pagination)
+POSTS_PER_PAGE = int(os.getenv('BLOG_PAGE_SIZE', 10))
+
+# Renderer configuration is part of the compiled-content cache key
+RENDERER_CONFIG_HASH = content_cache.config_hash({'loader': 'blog', **RENDERER_CONFIG})
+
 
 def get_blog_dir(lang: str = 'es') -> Path:
     """Get blog directory for specified language."""
     return CONTENT_DIR / lang / 'blog'
 
 
-def get_markdown_processor():
-    """Create configured markdown processor with extensions."""
-    return markdown.Markdown(
-        extensions=[
-            'fenced_code',
-            'codehilite',
-            'tables',
-            'toc',
-        ],
-        extension_configs={
-            'codehilite': {
-                'css_class': 'highlight',
-                'linenums': False,
-                'guess_lang': True,
-            }
-        }
-    )
-
-
-def strip_first_h1(html: str) -> str:
-    """Remove the first h1 tag from HTML to avoid title duplication."""
-    return re.sub(r'^(\s*<h1[^>]*>.*?</h1>\s*)', '', html, count=1, flags=re.DOTALL)
-
-
 def load_post(filepath: Path, lang: str = 'es') -> Optional[Dict]:
-    """Load a single blog post from a markdown file."""
-    try:
-        post = frontmatter.load(filepath)
+    """Load a single blog post, reusing the compiled-content cache when fresh."""
+    from data.compiler import compile_files
+    return compile_files([('blog', filepath, lang)])[('blog', str(filepath))]
 
-        # Process markdown content
-        md = get_markdown_processor()
-        html_content = md.convert(post.content)
 
-        # Remove first h1 to avoid duplication with page title
-        html_content = strip_first_h1(html_content)
+def compile_post(filepath: Path, lang: str = 'es') -> Optional[Dict]:
+    """Compile a single blog post from a markdown file."""
+    try:
+        # Frontmatter and word count only: the body is rendered on first access (see LazyRecord)
+        post, body = read_document(filepath)
 
         # Determine category from folder structure
         blog_dir = get_blog_dir(lang)
@@ -96,8 +82,7 @@ def load_post(filepath: Path, lang: str = 'es') -> Optional[Dict]:
             'tags': post.get('tags', []),
             'excerpt': post.get('excerpt', ''),
             'category': post.get('category', folder_category),
-            'content': post.content,  # Raw markdown
-            'html': html_content,      # Rendered HTML
+            **text_stats(body),
             'filepath': str(filepath),
             'lang': lang,
         }
@@ -114,47 +99,76 @@ def get_all_posts(lang: str = None, refresh: bool = False) -> List[Dict]:
         lang: Language code ('es', 'en'). If None, uses current language.
         refresh: If True, bypass cache and reload from disk.
     """
+    return get_post_index(lang, refresh).items
+
+
+def get_post_index(lang: str = None, refresh: bool = False) -> ContentIndex:
+    """Get the slug-indexed posts for a language (see data.content_store)."""
     if lang is None:
         from services.i18n import get_language
         lang = get_language()
 
     if refresh:
-        _get_posts_cached.cache_clear()
-    return _get_posts_cached(lang)
+        post_store.clear(lang)
+    return post_store.get(lang)
 
 
-@lru_cache(maxsize=4)
-def _get_posts_cached(lang: str) -> List[Dict]:
-    """Cached version of post loading (per language)."""
-    posts = []
-    blog_dir = get_blog_dir(lang)
-    print(f"[blog_loader] Loading posts for lang={lang} from {blog_dir}")
+def get_posts_page(page: int = 1, lang: str = None) -> Tuple[List[Dict], int]:
+    """
+    One page of posts (newest first).
+
+    Returns:
+        (posts, page_count); posts is empty when page is out of range.
+    """
+    index = get_post_index(lang)
+    if not POSTS_PER_PAGE:
+        return (index.items if page == 1 else []), 1
+    return index.page(page, POSTS_PER_PAGE), index.page_count(POSTS_PER_PAGE)
+
+
+def get_posts_after(slug: str, lang: str = None) -> Optional[List[Dict]]:
+    """The page of posts following slug (cursor pagination), None if slug is unknown."""
+    index = get_post_index(lang)
+    return index.after(slug, POSTS_PER_PAGE or len(index.items))
+
 
+def list_post_files(lang: str) -> List[Path]:
+    """All markdown files in the blog directory and its subdirectories."""
+    blog_dir = get_blog_dir(lang)
     if not blog_dir.exists():
         blog_dir.mkdir(parents=True, exist_ok=True)
-        return posts
+        return []
+    return sorted(blog_dir.rglob('*.md'))
 
-    # Recursively find all .md files in blog directory and subdirectories
-    for filepath in blog_dir.rglob('*.md'):
-        post = load_post(filepath, lang)
-        if post:
-            posts.append(post)
 
-    # Sort by date, newest first
-    posts.sort(key=lambda p: p['date'], reverse=True)
-    return posts
+# Per-language indexes, newest first (patched in place by data/watcher.py)
+post_store = ContentStore('blog', list_post_files, sort_key=lambda p: p['date'], reverse=True,
+                          facets={'tag': lambda p: p.get('tags') or [], 'category': lambda p: [p.get('category')]})
 
 
 def get_post_by_slug(slug: str, lang: str = None) -> Optional[Dict]:
     """Get a single post by its slug."""
-    posts = get_all_posts(lang)
-    return next((p for p in posts if p['slug'] == slug), None)
+    return get_post_index(lang).get(slug)
+
+
+def get_posts_by_tag(tag: str, lang: str = None) -> Optional[Tuple[str, List[Dict]]]:
+    """(tag label, posts newest first) for a tag or its URL key, None if unknown."""
+    return get_post_index(lang).facet('tag', tag)
+
+
+def get_posts_by_category(category: str, lang: str = None) -> Optional[Tuple[str, List[Dict]]]:
+    """(category label, posts newest first) for a category or its URL key, None if unknown."""
+    return get_post_index(lang).facet('category', category)
+
+
+def get_post_neighbours(slug: str, lang: str = None) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Get the (previous, next) posts by date for a slug: older and newer."""
+    return get_post_index(lang).get_neighbours(slug)
 
 
 def render_markdown(content: str) -> str:
     """Render markdown content to HTML."""
-    md = get_markdown_processor()
-    return md.convert(dedent(content).strip())
+    return render_snippet(content)
 
 
 # For backwards compatibility with existing code
@@ -163,11 +177,14 @@ def get_blog_posts() -> List[Dict]:
     return get_all_posts()
 
 
-def clear_blog_cache():
-    """Clear the blog posts cache (useful for development)."""
-    _get_posts_cached.cache_clear()
-    print("[blog_loader] Cache cleared")
-
+def clear_blog_cache(persistent: bool = False):
+    """
+    Clear the in-memory blog posts cache (useful for development).
 
-# Clear cache on module load to ensure fresh data on server restart
-clear_blog_cache()
+    Compiled posts on disk are revalidated per file (mtime + content hash),
+    so they only need to be dropped when persistent=True is requested.
+    """
+    post_store.clear()
+    if persistent:
+        content_cache.clear('blog')
+    print("[blog_loader] Cache cleared")
@@ -0,0 +1,240 @@
+"""
+Shared memory-mapped store of rendered content bodies.
+
+preload_content() writes every rendered body (html, toc, anchors) into a
+single file under CONTENT_CACHE_DIR that each gunicorn worker maps
+read-only, so the HTML lives once in the OS page cache instead of once
+per worker on the compiled records:
+
+    b'PFBODY01' | index size (uint64 LE) | JSON index | HTML blobs (UTF-8)
+
+The index maps (kind, renderer config hash, file path) to the blob's
+offset and length, the source file's mtime and size, and the (small) toc
+and anchors. get() checks the source file once and returns a SharedBody,
+which LazyRecord keeps: its HTML is a zero-copy memoryview slice of the
+mapping, and the last DECODED_BODIES decoded to str are kept per process
+so a page render decodes its body once, not on every access.
+
+The first worker to start builds the file under an exclusive lock: the
+bodies it lacks are rendered as one batch by the caller (in parallel, see
+compiler.render_bodies) before anything is written, and the new file is
+swapped in with an atomic rename; the others find it fresh and just map
+it. Files edited after that (hot reload) get a new record from the
+watcher, whose lookup no longer matches the entry, so it falls back to
+per-record rendering until the next start.
+
+Settings (.env):
+    CONTENT_SHARED=false           # Keep bodies on each worker's records
+"""
+
+import os
+import json
+import mmap
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from data import content_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialised (the rename is still atomic)
+    fcntl = None
+
+SHARED_ENABLED = os.getenv('CONTENT_SHARED', 'true').lower() != 'false'
+STORE_PATH = content_cache.CACHE_DIR / 'bodies.bin'
+
+MAGIC = b'PFBODY01'
+HEADER = struct.Struct('<8sQ')
+
+# Decoded bodies kept per mapped store (most recently used)
+DECODED_BODIES = 16
+
+# A body to store: (kind, renderer config hash, source file)
+BodySource = Tuple[str, str, Path]
+# Renders a batch of bodies: sources -> {source: {'html', 'toc', 'anchors'}}
+# (sources that failed to render are left out)
+BodyRenderer = Callable[[List[BodySource]], Dict[BodySource, Dict]]
+
+
+def _key(kind: str, config_key: str, filepath: Path) -> str:
+    return f'{kind}:{config_key}:{filepath}'
+
+
+class BodyStore:
+    """Read-only mapping of a bodies file."""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a bodies file')
+        data_start = HEADER.size + index_size
+        # key -> [offset, length, mtime_ns, size, toc, anchors]
+        self.entries: Dict[str, List] = json.loads(self._map[HEADER.size:data_start])
+        self._data = memoryview(self._map)[data_start:]
+        self.size = len(self._map)
+        self._decoded = lru_cache(maxsize=DECODED_BODIES)(self._decode)
+
+    def fresh(self, key: str, filepath: Path) -> Optional[List]:
+        """Index entry for a body, unless its source file changed since."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+        if entry[2] != stat.st_mtime_ns or entry[3] != stat.st_size:
+            return None
+        return entry
+
+    def html(self, entry: List) -> memoryview:
+        offset, length = entry[0], entry[1]
+        return self._data[offset:offset + length]
+
+    def _decode(self, offset: int, length: int) -> str:
+        return str(self._data[offset:offset + length], 'utf-8')
+
+    def text(self, entry: List) -> str:
+        """HTML of an entry as str (recently decoded ones are reused)."""
+        return self._decoded(entry[0], entry[1])
+
+
+class SharedBody:
+    """A body in a mapped store, whose source file was checked when it was looked up."""
+
+    __slots__ = ('store', 'entry')
+
+    def __init__(self, store: BodyStore, entry: List):
+        self.store = store
+        self.entry = entry
+
+    @property
+    def html(self) -> memoryview:
+        """Zero-copy slice of the mapping."""
+        return self.store.html(self.entry)
+
+    def text(self) -> str:
+        return self.store.text(self.entry)
+
+    @property
+    def toc(self) -> List:
+        return self.entry[4]
+
+    @property
+    def anchors(self) -> List:
+        return self.entry[5]
+
+
+_store: Optional[BodyStore] = None
+
+
+def _open(path: Path = STORE_PATH) -> Optional[BodyStore]:
+    try:
+        return BodyStore(path)
+    except (OSError, ValueError, struct.error) as e:
+        if path.exists():
+            print(f"[body_store] Ignoring unreadable {path}: {e}")
+        return None
+
+
+def _stale(store: Optional[BodyStore], sources: List[BodySource]) -> List[BodySource]:
+    if store is None:
+        return sources
+    return [source for source in sources if store.fresh(_key(*source), source[2]) is None]
+
+
+def _write(path: Path, sources: List[BodySource], previous: Optional[BodyStore],
+           rendered: Dict[BodySource, Dict]) -> None:
+    """Write a new bodies file for sources from fresh blobs of the previous one and rendered bodies."""
+    entries: Dict[str, List] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for source in sources:
+        kind, config_key, filepath = source
+        key = _key(kind, config_key, filepath)
+        entry = previous.fresh(key, filepath) if previous is not None else None
+        try:
+            stat = filepath.stat()
+        except OSError:
+            continue
+        if entry is not None:
+            html, toc, anchors = bytes(previous.html(entry)), entry[4], entry[5]
+        else:
+            body = rendered.get(source)
+            if body is None:
+                continue
+            html, toc, anchors = body['html'].encode('utf-8'), body['toc'], body['anchors']
+        entries[key] = [offset, len(html), stat.st_mtime_ns, stat.st_size, toc, anchors]
+        blobs.append(html)
+        offset += len(html)
+
+    index = json.dumps(entries, separators=(',', ':'), default=str).encode('utf-8')
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(index)))
+        f.write(index)
+        f.writelines(blobs)
+    # Workers that mapped the old file keep reading it until they remap
+    os.replace(tmp, path)
+
+
+def ensure(sources: Iterable[BodySource], render: BodyRenderer) -> bool:
+    """
+    Map a bodies file covering every source, building it if needed.
+
+    Args:
+        sources: (kind, config hash, file) of every body to serve from the store.
+        render: Renders the missing or stale bodies, called once with all of them.
+
+    Returns:
+        True if the store is mapped.
+    """
+    global _store, SHARED_ENABLED
+
+    if not SHARED_ENABLED:
+        return False
+    sources = list(sources)
+
+    store = _open()
+    if _stale(store, sources):
+        try:
+            STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(STORE_PATH.with_name(f'{STORE_PATH.name}.lock'), 'w') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # Another worker may have rebuilt it while we waited
+                store = _open()
+                stale = _stale(store, sources)
+                if stale:
+                    rendered = render(stale)
+                    print(f"[body_store] Writing {len(sources)} bodies to {STORE_PATH} ({len(rendered)} rendered)")
+                    _write(STORE_PATH, sources, store, rendered)
+                    store = _open()
+        except OSError as e:
+            print(f"[body_store] Disabled, cannot write {STORE_PATH}: {e}")
+            SHARED_ENABLED = False
+            return False
+
+    _store = store
+    return store is not None
+
+
+def get(kind: str, config_key: str, filepath: Path) -> Optional[SharedBody]:
+    """
+    Shared body of a file (stats the file: look it up once per record).
+
+    Returns None when the store is not mapped, does not have the file or
+    the file changed since it was written.
+    """
+    store = _store
+    if store is None:
+        return None
+    entry = store.fresh(_key(kind, config_key, filepath), filepath)
+    if entry is None:
+        return None
+    return SharedBody(store, entry)
+
@@ -0,0 +1,294 @@
+"""
+Content compilation driver.
+
+Compilation is two-tier:
+- compile_files() only reads frontmatter and counts words to build the
+  listing records used by /blog, /projects and the homepage sections.
+- The markdown body is rendered to HTML (plus its TOC and heading anchors)
+  the first time a record's 'html' is accessed (see LazyRecord), then kept
+  on the record and on disk.
+
+Both tiers reuse the persistent compiled-content cache, and cache misses
+are fanned out over a ProcessPoolExecutor when there are enough of them
+to pay for the pool (forked children; platforms without fork compile
+serially).
+
+Settings (.env):
+    CONTENT_PARALLEL=false        # Always compile serially
+    CONTENT_PARALLEL_MIN=8        # Minimum cache misses before using the pool
+    CONTENT_WORKERS=4             # Pool size (defaults to available cores)
+    CONTENT_PRELOAD=false         # Skip compiling everything at startup
+
+With the shared body store enabled (see data/body_store.py), preloading
+also writes every rendered body (rendering the missing ones in one
+parallel batch) to a memory-mapped file that all worker processes read, and records serve their 'html' from it instead of
+keeping their own copy.
+"""
+
+import os
+import yaml
+import multiprocessing
+import frontmatter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+from data import body_store, content_cache
+
+PARALLEL_ENABLED = os.getenv('CONTENT_PARALLEL', 'true').lower() != 'false'
+PARALLEL_MIN = int(os.getenv('CONTENT_PARALLEL_MIN', 8))
+
+# A compile task: (kind, filepath, lang) where kind is 'blog' or 'project'
+Task = Tuple[str, Path, str]
+
+# Records compiled by preload_content() that the loaders have not picked up
+# yet. Only used when the persistent cache is disabled.
+_pending: Dict[Tuple[str, str], Dict] = {}
+
+
+def available_workers() -> int:
+    """Number of processes to use for parallel compilation."""
+    configured = os.getenv('CONTENT_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def _loader(kind: str):
+    """Return (compile_fn, render_body_fn, config_hash) for a content kind."""
+    from data.rendering import render_document
+    if kind == 'blog':
+        from data import blog_loader
+        return blog_loader.compile_post, render_document, blog_loader.RENDERER_CONFIG_HASH
+    from data import project_loader
+    return project_loader.compile_project, render_document, project_loader.RENDERER_CONFIG_HASH
+
+
+def read_document(filepath: Path) -> Tuple[Dict, str]:
+    """
+    Split a markdown file into its parsed YAML frontmatter and raw body.
+
+    The body is not rendered: listing records only need its word count.
+    """
+    with open(filepath, 'r', encoding='utf-8-sig') as f:
+        first = f.readline()
+        if first.strip() != '---':
+            return {}, first + f.read()
+        lines = []
+        for line in f:
+            if line.strip() == '---':
+                break
+            lines.append(line)
+        body = f.read()
+    return yaml.safe_load(''.join(lines)) or {}, body
+
+
+def _body_namespace(kind: str) -> str:
+    return f'{kind}-body'
+
+
+# Record keys filled in by rendering the body
+BODY_KEYS = ('html', 'toc', 'anchors')
+EMPTY_BODY = {'html': '', 'toc': [], 'anchors': []}
+
+
+def load_body(kind: str, filepath: Path) -> Dict:
+    """Rendered body of a content file (html, toc, anchors), through the persistent cache."""
+    _, render_fn, config_key = _loader(kind)
+    record = content_cache.cached_compile(filepath, _body_namespace(kind), config_key, render_fn)
+    return {**EMPTY_BODY, **(record or {})}
+
+
+class LazyRecord(dict):
+    """
+    Compiled content record whose body is rendered on first access.
+
+    record['html'] (or 'toc' / 'anchors') comes from the shared body
+    store when it has the file (looked up once per record; the watcher
+    replaces the records of edited files, and the decoded HTML is not
+    kept on the record), otherwise the body is rendered, or loaded from
+    the on-disk cache, once and kept on the record;
+    record['content'] re-reads the raw markdown without keeping it. Note
+    that .get('html') does not trigger rendering.
+    """
+
+    def __init__(self, kind: str, data: Dict):
+        super().__init__(data)
+        self.kind = kind
+        self.shared: Optional[body_store.SharedBody] = None
+
+    def __missing__(self, key):
+        if key in BODY_KEYS:
+            if self.shared is None:
+                _, _, config_key = _loader(self.kind)
+                self.shared = body_store.get(self.kind, config_key, Path(self['filepath']))
+            if self.shared is not None:
+                return self.shared.text() if key == 'html' else getattr(self.shared, key)
+            try:
+                body = load_body(self.kind, Path(self['filepath']))
+            except Exception as e:
+                # Not kept: the next access tries again
+                print(f"Error rendering {self['filepath']}: {e}")
+                return '' if key == 'html' else []
+            self.update(body)
+            return body[key]
+        if key == 'content':
+            return frontmatter.load(self['filepath']).content
+        raise KeyError(key)
+
+
+def _compile_task(kind: str, filepath: str, lang: str) -> Optional[Dict]:
+    """Compile one file's listing record (runs inside a pool worker)."""
+    compile_fn, _, _ = _loader(kind)
+    return compile_fn(Path(filepath), lang)
+
+
+def _render_task(kind: str, filepath: str) -> Dict:
+    """Render one file's body (runs inside a pool worker)."""
+    _, render_fn, _ = _loader(kind)
+    return render_fn(Path(filepath))
+
+
+def _run(fn, arg_lists: List[List], parallel: Optional[bool]) -> List:
+    """Map fn over argument lists, on a process pool when worthwhile."""
+    count = len(arg_lists[0]) if arg_lists else 0
+    if parallel is None:
+        parallel = PARALLEL_ENABLED and count >= PARALLEL_MIN
+    workers = min(available_workers(), count)
+
+    # preload_content() runs while main.py is imported: under 'spawn' every
+    # child would re-import __main__ and preload again, so only fork
+    if parallel and workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        print(f"[compiler] Compiling {count} files on {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            return list(pool.map(fn, *arg_lists, chunksize=max(1, count // (workers * 4))))
+    return [fn(*args) for args in zip(*arg_lists)]
+
+
+def compile_files(tasks: Iterable[Task], parallel: Optional[bool] = None) -> Dict[Tuple[str, str], Optional[Dict]]:
+    """
+    Compile a batch of files, using the persistent cache where possible.
+
+    Args:
+        tasks: (kind, filepath, lang) tuples.
+        parallel: Force (True) or disable (False) the process pool.
+            Defaults to CONTENT_PARALLEL with the CONTENT_PARALLEL_MIN threshold.
+
+    Returns:
+        Dict mapping (kind, str(filepath)) to the compiled record (None on error).
+    """
+    results: Dict[Tuple[str, str], Optional[Dict]] = {}
+    misses: List[Task] = []
+
+    for kind, filepath, lang in tasks:
+        key = (kind, str(filepath))
+        record = _pending.pop(key, None)
+        if record is None:
+            _, _, config_key = _loader(kind)
+            record = content_cache.get(filepath, kind, config_key)
+        if record is not None:
+            results[key] = LazyRecord(kind, record)
+        else:
+            misses.append((kind, filepath, lang))
+
+    compiled = _run(_compile_task, [
+        [kind for kind, _, _ in misses],
+        [str(path) for _, path, _ in misses],
+        [lang for _, _, lang in misses],
+    ], parallel)
+
+    for (kind, filepath, _), record in zip(misses, compiled):
+        if record is not None:
+            _, _, config_key = _loader(kind)
+            content_cache.put(filepath, kind, config_key, record)
+            record = LazyRecord(kind, record)
+        results[(kind, str(filepath))] = record
+
+    return results
+
+
+def render_bodies(records: Iterable[Dict], parallel: Optional[bool] = None) -> None:
+    """
+    Render the bodies of many records up front (e.g. for a static export),
+    in parallel, storing them in the persistent cache and on the records.
+    """
+    pending = []
+    for record in records:
+        if 'html' in record:
+            continue
+        _, _, config_key = _loader(record.kind)
+        cached = content_cache.get(Path(record['filepath']), _body_namespace(record.kind), config_key)
+        if cached is not None:
+            record.update({**EMPTY_BODY, **cached})
+        else:
+            pending.append(record)
+
+    rendered = _run(_render_task, [
+        [record.kind for record in pending],
+        [record['filepath'] for record in pending],
+    ], parallel)
+
+    for record, body in zip(pending, rendered):
+        _, _, config_key = _loader(record.kind)
+        content_cache.put(Path(record['filepath']), _body_namespace(record.kind), config_key, body)
+        record.update(body)
+
+
+def preload_content(langs: Optional[Iterable[str]] = None, bodies: bool = False) -> None:
+    """
+    Compile blog posts and projects for all languages in one batch and
+    warm the loaders' in-memory caches.
+
+    Args:
+        langs: Languages to load (defaults to SUPPORTED_LANGUAGES).
+        bodies: Also render every markdown body instead of on first access.
+    """
+    from data import blog_loader, project_loader
+    from services.i18n import SUPPORTED_LANGUAGES
+
+    langs = list(langs or SUPPORTED_LANGUAGES)
+    tasks: List[Task] = []
+    for lang in langs:
+        tasks += [('blog', path, lang) for path in blog_loader.list_post_files(lang)]
+        tasks += [('project', path, lang) for path in project_loader.list_project_files(lang)]
+
+    results = compile_files(tasks)
+    if not content_cache.CACHE_ENABLED:
+        _pending.update({key: record for key, record in results.items() if record is not None})
+
+    records = []
+    for lang in langs:
+        records += blog_loader.get_all_posts(lang)
+        records += project_loader.get_all_projects(lang)
+
+    if bodies:
+        render_bodies(records)
+
+    if body_store.SHARED_ENABLED:
+        share_bodies(records)
+
+
+def share_bodies(records: List[LazyRecord]) -> None:
+    """
+    Serve the bodies of records from the shared body store, rendering the
+    ones it lacks in one parallel batch first.
+    """
+    by_source = {(record.kind, _loader(record.kind)[2], Path(record['filepath'])): record for record in records}
+
+    def render(stale: List[body_store.BodySource]) -> Dict[body_store.BodySource, Dict]:
+        pending = [by_source[source] for source in stale]
+        try:
+            render_bodies(pending)
+        except Exception as e:
+            print(f"[compiler] Error rendering bodies: {e}")
+        return {source: {key: dict.get(record, key) for key in BODY_KEYS}
+                for source, record in zip(stale, pending) if 'html' in record}
+
+    if body_store.ensure(by_source, render):
+        for record in records:
+            # Served from the store from now on, not from the record
+            for key in BODY_KEYS:
+                record.pop(key, None)
@@ -0,0 +1,220 @@
+"""
+Persistent compiled-content cache.
+
+Compiled markdown records (frontmatter + rendered HTML) are stored in a
+SQLite database under CONTENT_CACHE_DIR, so restarting a worker only
+recompiles the files that actually changed.
+
+Syntax-highlighted code blocks are stored in the same database, keyed by
+content hash (see data/highlight.py).
+
+Each compiled entry is keyed by (namespace, file path) and is only reused when:
+- the renderer config hash matches (extensions, options, library versions)
+- the file mtime and size match (fast path, the file is not even read), or
+- the sha256 of the file bytes matches (survives `touch` / git checkouts)
+
+Settings (.env):
+    CONTENT_CACHE=false            # Disable the on-disk cache
+    CONTENT_CACHE_DIR=/tmp/cache   # Defaults to <project>/.cache
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from data.database import ProcessConnection
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.getenv('CONTENT_CACHE_DIR', BASE_DIR / '.cache'))
+CACHE_ENABLED = os.getenv('CONTENT_CACHE', 'true').lower() != 'false'
+CACHE_DB = CACHE_DIR / 'content.sqlite3'
+
+# Bump when the shape of compiled records changes
+SCHEMA_VERSION = 2
+
+_lock = threading.Lock()
+_db = ProcessConnection(CACHE_DB, """
+    CREATE TABLE IF NOT EXISTS compiled (
+        namespace TEXT NOT NULL,
+        path TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        config_hash TEXT NOT NULL,
+        record TEXT NOT NULL,
+        PRIMARY KEY (namespace, path)
+    );
+    CREATE TABLE IF NOT EXISTS highlights (
+        key TEXT PRIMARY KEY,
+        html TEXT NOT NULL
+    );
+""")
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """Open (or reuse) the cache database for the current process."""
+    global CACHE_ENABLED
+
+    if not CACHE_ENABLED:
+        return None
+    try:
+        return _db.get()
+    except (OSError, sqlite3.Error) as e:
+        print(f"[content_cache] Disabled, cannot open {CACHE_DB}: {e}")
+        CACHE_ENABLED = False
+        return None
+
+
+def config_hash(config: Dict) -> str:
+    """Stable short hash of a renderer configuration."""
+    payload = json.dumps({'schema': SCHEMA_VERSION, **config}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def file_hash(data: bytes) -> str:
+    """Content hash of raw file bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def get(filepath: Path, namespace: str, config_key: str) -> Optional[Dict]:
+    """Return the cached record for a file, or None if missing or stale."""
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return None
+
+        try:
+            stat = filepath.stat()
+            row = conn.execute(
+                'SELECT mtime_ns, size, content_hash, config_hash, record '
+                'FROM compiled WHERE namespace = ? AND path = ?',
+                (namespace, str(filepath))
+            ).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+
+        if row is None:
+            return None
+
+        mtime_ns, size, content_hash, cached_config, record = row
+        if cached_config != config_key:
+            return None
+
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            # mtime changed: only reuse if the bytes are really identical
+            try:
+                if file_hash(filepath.read_bytes()) != content_hash:
+                    return None
+                conn.execute(
+                    'UPDATE compiled SET mtime_ns = ?, size = ? WHERE namespace = ? AND path = ?',
+                    (stat.st_mtime_ns, stat.st_size, namespace, str(filepath))
+                )
+                conn.commit()
+            except (OSError, sqlite3.Error):
+                return None
+
+        return json.loads(record)
+
+
+def put(filepath: Path, namespace: str, config_key: str, record: Dict) -> None:
+    """Store a compiled record for a file."""
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return
+
+        try:
+            stat = filepath.stat()
+            content_hash = file_hash(filepath.read_bytes())
+            conn.execute(
+                'INSERT OR REPLACE INTO compiled '
+                '(namespace, path, mtime_ns, size, content_hash, config_hash, record) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (namespace, str(filepath), stat.st_mtime_ns, stat.st_size,
+                 content_hash, config_key, json.dumps(record, default=str))
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[content_cache] Could not store {filepath}: {e}")
+
+
+def cached_compile(filepath: Path, namespace: str, config_key: str,
+                   compile_fn: Callable[[Path], Optional[Dict]]) -> Optional[Dict]:
+    """
+    Return the cached record for a file, compiling and storing it on a miss.
+
+    Args:
+        filepath: Source markdown file.
+        namespace: Record kind ('blog', 'project').
+        config_key: Renderer config hash (see config_hash()).
+        compile_fn: Compiles the file into a record, or returns None on error.
+    """
+    record = get(filepath, namespace, config_key)
+    if record is not None:
+        return record
+
+    record = compile_fn(filepath)
+    if record is not None:
+        put(filepath, namespace, config_key, record)
+    return record
+
+
+def prune(namespace: str, existing_paths) -> None:
+    """Drop entries for files that no longer exist."""
+    keep = {str(p) for p in existing_paths}
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return
+        try:
+            rows = conn.execute('SELECT path FROM compiled WHERE namespace = ?', (namespace,)).fetchall()
+            stale = [(namespace, path) for (path,) in rows if path not in keep and not Path(path).exists()]
+            if stale:
+                conn.executemany('DELETE FROM compiled WHERE namespace = ? AND path = ?', stale)
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+
+def get_highlight(key: str) -> Optional[str]:
+    """Return a cached highlighted code block by content hash."""
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute('SELECT html FROM highlights WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+
+def put_highlight(key: str, html: str) -> None:
+    """Store a highlighted code block by content hash."""
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return
+        try:
+            conn.execute('INSERT OR REPLACE INTO highlights (key, html) VALUES (?, ?)', (key, html))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[content_cache] Could not store highlight: {e}")
+
+
+def clear(namespace: Optional[str] = None) -> None:
+    """Remove cached entries (all, or only for one namespace)."""
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return
+        if namespace is None:
+            conn.execute('DELETE FROM compiled')
+            conn.execute('DELETE FROM highlights')
+        else:
+            conn.execute('DELETE FROM compiled WHERE namespace = ?', (namespace,))
+        conn.commit()
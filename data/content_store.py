@@ -0,0 +1,242 @@
+"""
+In-memory indexes over compiled content.
+
+Each loader keeps one ContentIndex per language: the sorted list used by
+listing pages, a hash index by slug for detail pages and the precomputed
+previous/next neighbours in list order, plus slug positions so pages and
+cursors are plain list slices, and facet maps (tag -> posts, technology
+-> projects, ...) so tag pages are a dict lookup instead of a scan over
+every item. ContentStore owns those indexes
+and patches them file by file on hot reload (see data/watcher.py).
+"""
+
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from data import content_cache
+
+
+@dataclass
+class ContentIndex:
+    items: List[Dict] = field(default_factory=list)
+    by_slug: Dict[str, Dict] = field(default_factory=dict)
+    # slug -> (previous, next) where previous is the item after it in the
+    # list (older, for newest-first lists) and next is the item before it
+    neighbours: Dict[str, Tuple[Optional[Dict], Optional[Dict]]] = field(default_factory=dict)
+    # slug -> index in items
+    positions: Dict[str, int] = field(default_factory=dict)
+    # facet -> value key -> items in list order, and value key -> display label
+    facets: Dict[str, Dict[str, List[Dict]]] = field(default_factory=dict)
+    facet_labels: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def get(self, slug: str) -> Optional[Dict]:
+        return self.by_slug.get(slug)
+
+    def get_neighbours(self, slug: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        return self.neighbours.get(slug, (None, None))
+
+    def page_count(self, per_page: int) -> int:
+        return max(1, -(-len(self.items) // per_page))
+
+    def page(self, number: int, per_page: int) -> List[Dict]:
+        """Items of a 1-based page (empty if out of range)."""
+        if number < 1:
+            return []
+        start = (number - 1) * per_page
+        return self.items[start:start + per_page]
+
+    def after(self, slug: str, limit: int) -> Optional[List[Dict]]:
+        """Up to limit items following slug in list order (None if slug is unknown)."""
+        position = self.positions.get(slug)
+        if position is None:
+            return None
+        return self.items[position + 1:position + 1 + limit]
+
+    def facet(self, name: str, value: str) -> Optional[Tuple[str, List[Dict]]]:
+        """(label, items) for one facet value such as a tag (None if unknown)."""
+        key = facet_key(value)
+        items = self.facets.get(name, {}).get(key)
+        if items is None:
+            return None
+        return self.facet_labels[name][key], items
+
+    def facet_values(self, name: str) -> List[Tuple[str, str, int]]:
+        """(key, label, item count) of every value of a facet, by label."""
+        labels = self.facet_labels.get(name, {})
+        return sorted(((key, labels[key], len(items)) for key, items in self.facets.get(name, {}).items()),
+                      key=lambda entry: entry[1].lower())
+
+
+_NON_SLUG_RE = re.compile(r'[^a-z0-9]+')
+# Symbols that tell technologies apart ('C', 'C#', 'C++', '.NET'), spelled out before slugging
+_SYMBOL_WORDS = [(re.compile(r'#'), ' sharp '), (re.compile(r'\+'), ' plus '), (re.compile(r'^\.(?=\w)'), 'dot ')]
+
+
+def facet_key(value: str) -> str:
+    """URL key of a facet value: 'Machine Learning' -> 'machine-learning', 'C#' -> 'c-sharp'."""
+    folded = str(value).lower().strip()
+    for pattern, word in _SYMBOL_WORDS:
+        folded = pattern.sub(word, folded)
+    folded = unicodedata.normalize('NFKD', folded)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return _NON_SLUG_RE.sub('-', folded).strip('-')
+
+
+def build_index(items: List[Dict],
+                facets: Optional[Dict[str, Callable[[Dict], Iterable[str]]]] = None) -> ContentIndex:
+    """
+    Build slug, neighbour and facet indexes for an already sorted list.
+
+    Args:
+        items: Records in list order.
+        facets: Facet name -> function returning the values of one record.
+    """
+    by_slug: Dict[str, Dict] = {}
+    for item in items:
+        # Keep the first item if two files share a slug (same as the old linear scan)
+        by_slug.setdefault(item['slug'], item)
+
+    neighbours = {}
+    positions = {}
+    for idx, item in enumerate(items):
+        previous = items[idx + 1] if idx + 1 < len(items) else None
+        following = items[idx - 1] if idx > 0 else None
+        neighbours.setdefault(item['slug'], (previous, following))
+        positions.setdefault(item['slug'], idx)
+
+    facet_items: Dict[str, Dict[str, List[Dict]]] = {}
+    facet_labels: Dict[str, Dict[str, str]] = {}
+    for name, values_of in (facets or {}).items():
+        by_value = facet_items[name] = {}
+        labels = facet_labels[name] = {}
+        for item in items:
+            seen = set()
+            for value in values_of(item):
+                key = facet_key(value) if value else ''
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                # The first spelling in list order is the label
+                labels.setdefault(key, str(value))
+                by_value.setdefault(key, []).append(item)
+
+    return ContentIndex(items=items, by_slug=by_slug, neighbours=neighbours, positions=positions,
+                        facets=facet_items, facet_labels=facet_labels)
+
+
+# Callbacks run after a store swaps in a new index: fn(kind, lang)
+_listeners: List[Callable[[str, str], None]] = []
+
+# Bumped before callbacks run, so caches keyed on it never serve data
+# rendered before a change, whatever order their callbacks run in
+_content_version = 0
+
+
+def subscribe(callback: Callable[[str, str], None]) -> None:
+    """Register a callback for content changes (full loads and hot reloads)."""
+    _listeners.append(callback)
+
+
+def content_version() -> int:
+    """Counter incremented on every content, locale or site data change."""
+    return _content_version
+
+
+def notify(kind: str, lang: str) -> None:
+    """Run content-change callbacks (kind is 'blog', 'project', 'locale' or 'site')."""
+    global _content_version
+    _content_version += 1
+    for callback in _listeners:
+        callback(kind, lang)
+
+
+class ContentStore:
+    """
+    Per-language ContentIndex cache for one kind of content.
+
+    Indexes are immutable once built: reloads build a new index and swap
+    it in with a single assignment, so readers never see a partial update.
+    """
+
+    def __init__(self, kind: str, list_files: Callable[[str], List[Path]],
+                 sort_key: Callable[[Dict], object], reverse: bool = False,
+                 facets: Optional[Dict[str, Callable[[Dict], Iterable[str]]]] = None):
+        self.kind = kind
+        self.list_files = list_files
+        self.sort_key = sort_key
+        self.reverse = reverse
+        self.facets = facets or {}
+        self.version = 0
+        self._indexes: Dict[str, ContentIndex] = {}
+        self._lock = threading.RLock()
+
+    def get(self, lang: str) -> ContentIndex:
+        index = self._indexes.get(lang)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(lang)
+                if index is None:
+                    index = self._load(lang)
+        return index
+
+    def clear(self, lang: Optional[str] = None) -> None:
+        with self._lock:
+            if lang is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(lang, None)
+
+    def _load(self, lang: str) -> ContentIndex:
+        from data.compiler import compile_files
+
+        filepaths = self.list_files(lang)
+        print(f"[content_store] Loading {len(filepaths)} {self.kind} files for lang={lang}")
+        records = compile_files((self.kind, path, lang) for path in filepaths)
+        items = [records[(self.kind, str(path))] for path in filepaths]
+        for namespace in (self.kind, f'{self.kind}-body'):
+            content_cache.prune(namespace, filepaths)
+        return self._swap(lang, [item for item in items if item])
+
+    def _swap(self, lang: str, items: List[Dict]) -> ContentIndex:
+        items.sort(key=self.sort_key, reverse=self.reverse)
+        index = build_index(items, self.facets)
+        self._indexes[lang] = index
+        self.version += 1
+        notify(self.kind, lang)
+        return index
+
+    def update(self, lang: str, changed: Iterable[Path] = (), removed: Iterable[Path] = ()) -> ContentIndex:
+        """
+        Recompile only the given files and swap in a new index.
+
+        Args:
+            lang: Language of the files.
+            changed: Added or modified files.
+            removed: Deleted files.
+        """
+        from data.compiler import compile_files
+
+        changed = [Path(p) for p in changed]
+        removed = [Path(p) for p in removed]
+
+        with self._lock:
+            if lang not in self._indexes:
+                # Never loaded: nothing to patch, the next get() loads from disk
+                return self.get(lang)
+
+            stale = {str(p) for p in changed + removed}
+            items = [item for item in self._indexes[lang].items if item['filepath'] not in stale]
+
+            existing = [p for p in changed if p.exists()]
+            records = compile_files(((self.kind, path, lang) for path in existing), parallel=False)
+            items += [record for record in records.values() if record]
+
+            if removed:
+                filepaths = self.list_files(lang)
+                for namespace in (self.kind, f'{self.kind}-body'):
+                    content_cache.prune(namespace, filepaths)
+            return self._swap(lang, items)
@@ -0,0 +1,48 @@
+"""
+Per-process SQLite connections.
+
+The compiled-content cache, the contact outbox and the rate limiter each
+keep a small SQLite database shared by every gunicorn worker. They all
+open it the same way: WAL journal (readers never block the writer),
+synchronous=NORMAL, schema created on first use, and one connection per
+process, reopened after fork() since a connection must never be used by
+two processes.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+
+class ProcessConnection:
+    """Lazily opened WAL-mode connection to one database, reopened in each process."""
+
+    def __init__(self, path: Path, schema: str = '', autocommit: bool = False):
+        """
+        Args:
+            path: Database file (its directory is created on first use).
+            schema: SQL script run when the connection is opened (CREATE ... IF NOT EXISTS).
+            autocommit: Open in autocommit mode; transactions are then begun explicitly.
+        """
+        self.path = Path(path)
+        self.schema = schema
+        self.autocommit = autocommit
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def get(self) -> sqlite3.Connection:
+        """The connection for the current process (raises OSError / sqlite3.Error if it cannot be opened)."""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        kwargs = {'isolation_level': None} if self.autocommit else {}
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, **kwargs)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        if self.schema:
+            conn.executescript(self.schema)
+
+        self._conn, self._pid = conn, os.getpid()
+        return conn
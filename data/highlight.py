@@ -0,0 +1,174 @@
+"""
+Cached syntax highlighting for markdown code blocks.
+
+Drop-in replacement for the 'fenced_code' + 'codehilite' extension pair:
+- Highlighted HTML is cached by a hash of (code, language, Pygments
+  options and version), in memory and in the compiled-content database,
+  so blocks shared by the es/en trees are only highlighted once.
+- Lexers and formatters are resolved once per language and reused. Lexer
+  guessing (which tries every Pygments lexer) only happens for blocks
+  without a fence language; unknown languages fall back to plain text.
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import pygments
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.lexer import Lexer
+from pygments.util import ClassNotFound
+from markdown import Markdown
+from markdown.extensions.attr_list import get_attrs_and_remainder
+from markdown.extensions.codehilite import CodeHilite, CodeHiliteExtension, HiliteTreeprocessor, parse_hl_lines
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+
+from data import content_cache
+
+# In-process LRU in front of the on-disk cache
+MEMORY_CACHE_SIZE = 1024
+_memory_cache: 'OrderedDict[str, str]' = OrderedDict()
+# Lazy renders run on request threads
+_memory_lock = threading.Lock()
+
+
+@lru_cache(maxsize=128)
+def _lexer_by_name(lang: str) -> Lexer:
+    try:
+        return get_lexer_by_name(lang)
+    except ClassNotFound:
+        return get_lexer_by_name('text')
+
+
+@lru_cache(maxsize=128)
+def _formatter(lang_str: str, options_key: str) -> HtmlFormatter:
+    return HtmlFormatter(lang_str=lang_str, **json.loads(options_key))
+
+
+def resolve_lexer(code: str, lang: Optional[str]):
+    """Return (lexer, lang): by fence language when given, guessed otherwise."""
+    if lang:
+        return _lexer_by_name(lang), lang
+    try:
+        lexer = guess_lexer(code)
+    except ClassNotFound:
+        lexer = _lexer_by_name('text')
+    return lexer, lexer.aliases[0]
+
+
+def highlight_key(code: str, lang: Optional[str], options: Dict[str, Any], lang_prefix: str) -> str:
+    """Content address of a highlighted block."""
+    payload = json.dumps([code, lang, options, lang_prefix, pygments.__version__], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def highlight_code(code: str, lang: Optional[str], options: Dict[str, Any], lang_prefix: str = 'language-') -> str:
+    """Highlight a code block, reusing any previous result for the same input."""
+    key = highlight_key(code, lang, options, lang_prefix)
+
+    with _memory_lock:
+        html = _memory_cache.get(key)
+        if html is not None:
+            _memory_cache.move_to_end(key)
+            return html
+
+    html = content_cache.get_highlight(key)
+    if html is None:
+        lexer, lang = resolve_lexer(code, lang)
+        options_key = json.dumps(options, sort_keys=True, default=str)
+        html = highlight(code, lexer, _formatter(f'{lang_prefix}{lang}', options_key))
+        content_cache.put_highlight(key, html)
+
+    with _memory_lock:
+        _memory_cache[key] = html
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return html
+
+
+class CachedCodeHilite(CodeHilite):
+    """CodeHilite that goes through highlight_code()."""
+
+    def hilite(self, shebang: bool = True) -> str:
+        self.src = self.src.strip('\n')
+        if self.lang is None and shebang:
+            self._parseHeader()
+        return highlight_code(self.src, self.lang, self.options, self.lang_prefix)
+
+
+class CachedFencedBlockPreprocessor(FencedBlockPreprocessor):
+    """Fenced code blocks, always highlighted through CachedCodeHilite."""
+
+    def run(self, lines: list) -> list:
+        text = '\n'.join(lines)
+        index = 0
+        while True:
+            m = self.FENCED_BLOCK_RE.search(text, index)
+            if not m:
+                break
+
+            lang, classes, config = None, [], {}
+            if m.group('attrs'):
+                attrs, remainder = get_attrs_and_remainder(m.group('attrs'))
+                if remainder:
+                    # Unbalanced braces: not a valid fence, skip over it
+                    index = m.end('attrs')
+                    continue
+                _, classes, config = self.handle_attrs(attrs)
+                if classes:
+                    lang = classes.pop(0)
+            else:
+                lang = m.group('lang') or None
+                if m.group('hl_lines'):
+                    config['hl_lines'] = parse_hl_lines(m.group('hl_lines'))
+
+            local_config = {**self.config, **config}
+            if classes:
+                local_config['css_class'] = f"{' '.join(classes)} {local_config['css_class']}"
+            highliter = CachedCodeHilite(
+                m.group('code'),
+                lang=lang,
+                style=local_config.pop('pygments_style', 'default'),
+                **local_config
+            )
+
+            placeholder = self.md.htmlStash.store(highliter.hilite(shebang=False))
+            text = f'{text[:m.start()]}\n{placeholder}\n{text[m.end():]}'
+            index = m.start() + 1 + len(placeholder)
+        return text.split('\n')
+
+
+class CachedHiliteTreeprocessor(HiliteTreeprocessor):
+    """Indented code blocks, highlighted through CachedCodeHilite."""
+
+    def run(self, root) -> None:
+        for block in root.iter('pre'):
+            if len(block) == 1 and block[0].tag == 'code' and block[0].text is not None:
+                local_config = self.config.copy()
+                code = CachedCodeHilite(
+                    self.code_unescape(block[0].text),
+                    tab_length=self.md.tab_length,
+                    style=local_config.pop('pygments_style', 'default'),
+                    **local_config
+                )
+                placeholder = self.md.htmlStash.store(code.hilite())
+                block.clear()
+                block.tag = 'p'
+                block.text = placeholder
+
+
+class CachedHighlightExtension(CodeHiliteExtension):
+    """Replaces both 'fenced_code' and 'codehilite' (accepts codehilite's config)."""
+
+    def extendMarkdown(self, md: Markdown) -> None:
+        hiliter = CachedHiliteTreeprocessor(md)
+        hiliter.config = self.getConfigs()
+        md.treeprocessors.register(hiliter, 'hilite', 30)
+
+        md.preprocessors.register(CachedFencedBlockPreprocessor(md, self.getConfigs()), 'fenced_code_block', 25)
+        md.registerExtension(self)
@@ -32,57 +32,37 @@ excerpt: Short description for cards
 ...
 """
 
-import re
-import frontmatter
-import markdown
 from pathlib import Path
-from typing import List, Dict, Optional
-from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+from data import content_cache
+from data.compiler import read_document
+from data.rendering import RENDERER_CONFIG, text_stats
+from data.content_store import ContentIndex, ContentStore
 
 # Base content path
 CONTENT_DIR = Path(__file__).resolve().parent.parent / 'content'
 
+# Renderer configuration is part of the compiled-content cache key
+RENDERER_CONFIG_HASH = content_cache.config_hash({'loader': 'project', **RENDERER_CONFIG})
+
 
 def get_projects_dir(lang: str = 'es') -> Path:
     """Get projects directory for specified language."""
     return CONTENT_DIR / lang / 'projects'
 
 
-def get_markdown_processor():
-    """Create configured markdown processor with extensions."""
-    return markdown.Markdown(
-        extensions=[
-            'fenced_code',
-            'codehilite',
-            'tables',
-            'toc',
-        ],
-        extension_configs={
-            'codehilite': {
-                'css_class': 'highlight',
-                'linenums': False,
-                'guess_lang': True,
-            }
-        }
-    )
-
-
-def strip_first_h1(html: str) -> str:
-    """Remove the first h1 tag from HTML to avoid title duplication."""
-    return re.sub(r'^(\s*<h1[^>]*>.*?</h1>\s*)', '', html, count=1, flags=re.DOTALL)
-
-
 def load_project(filepath: Path, lang: str = 'es') -> Optional[Dict]:
-    """Load a single project from a markdown file."""
-    try:
-        project = frontmatter.load(filepath)
+    """Load a single project, reusing the compiled-content cache when fresh."""
+    from data.compiler import compile_files
+    return compile_files([('project', filepath, lang)])[('project', str(filepath))]
 
-        # Process markdown content
-        md = get_markdown_processor()
-        html_content = md.convert(project.content)
 
-        # Remove first h1 to avoid duplication with page title
-        html_content = strip_first_h1(html_content)
+def compile_project(filepath: Path, lang: str = 'es') -> Optional[Dict]:
+    """Compile a single project from a markdown file."""
+    try:
+        # Frontmatter and word count only: the body is rendered on first access (see LazyRecord)
+        project, body = read_document(filepath)
 
         return {
             'slug': project.get('slug', filepath.stem),
@@ -94,8 +74,7 @@ def load_project(filepath: Path, lang: str = 'es') -> Optional[Dict]:
             'demo': project.get('demo'),
             'featured': project.get('featured', False),
             'image': project.get('image', '/static/images/project-default.jpg'),
-            'content': project.content,  # Raw markdown
-            'html': html_content,         # Rendered HTML
+            **text_stats(body),
             'filepath': str(filepath),
             'lang': lang,
         }
@@ -112,34 +91,32 @@ def get_all_projects(lang: str = None, refresh: bool = False) -> List[Dict]:
         lang: Language code ('es', 'en'). If None, uses current language.
         refresh: If True, bypass cache and reload from disk.
     """
+    return get_project_index(lang, refresh).items
+
+
+def get_project_index(lang: str = None, refresh: bool = False) -> ContentIndex:
+    """Get the slug-indexed projects for a language (see data.content_store)."""
     if lang is None:
         from services.i18n import get_language
         lang = get_language()
 
     if refresh:
-        _get_projects_cached.cache_clear()
-    return _get_projects_cached(lang)
+        project_store.clear(lang)
+    return project_store.get(lang)
 
 
-@lru_cache(maxsize=4)
-def _get_projects_cached(lang: str) -> List[Dict]:
-    """Cached version of project loading (per language)."""
-    projects = []
+def list_project_files(lang: str) -> List[Path]:
+    """All markdown files in the projects directory."""
     projects_dir = get_projects_dir(lang)
-
     if not projects_dir.exists():
         projects_dir.mkdir(parents=True, exist_ok=True)
-        return projects
+        return []
+    return sorted(projects_dir.glob('*.md'))
 
-    # Find all .md files in projects directory
-    for filepath in projects_dir.glob('*.md'):
-        project = load_project(filepath, lang)
-        if project:
-            projects.append(project)
 
-    # Sort: featured first, then by title
-    projects.sort(key=lambda p: (not p['featured'], p['title']))
-    return projects
+# Per-language indexes: featured first, then by title (patched by data/watcher.py)
+project_store = ContentStore('project', list_project_files, sort_key=lambda p: (not p['featured'], p['title']),
+                             facets={'tech': lambda p: p.get('technologies') or []})
 
 
 def get_featured_projects(lang: str = None) -> List[Dict]:
@@ -149,5 +126,9 @@ def get_featured_projects(lang: str = None) -> List[Dict]:
 
 def get_project_by_slug(slug: str, lang: str = None) -> Optional[Dict]:
     """Get a single project by its slug."""
-    projects = get_all_projects(lang)
-    return next((p for p in projects if p['slug'] == slug), None)
+    return get_project_index(lang).get(slug)
+
+
+def get_projects_by_tech(tech: str, lang: str = None) -> Optional[Tuple[str, List[Dict]]]:
+    """(technology label, projects) for a technology or its URL key, None if unknown."""
+    return get_project_index(lang).facet('tech', tech)
@@ -0,0 +1,140 @@
+"""
+Shared Markdown rendering engine for blog posts and projects.
+
+Building a markdown.Markdown instance with all extensions is not free, so
+processors are created once per thread and reused via reset() instead of
+being rebuilt for every file.
+
+The first <h1> of a document duplicates the page title, so it is dropped
+by a treeprocessor while rendering rather than with a regex over the
+final HTML. Code blocks are highlighted through the cache in
+data/highlight.py.
+
+Document metadata is produced at compile time along with the HTML: the
+'toc' extension's heading tree and anchor ids are kept from the render
+(render_document), and word count / reading time come from the raw
+markdown (text_stats), so pages never re-process text per request.
+"""
+
+import re
+import threading
+import xml.etree.ElementTree as etree
+from pathlib import Path
+from textwrap import dedent
+from typing import Dict, List
+
+import frontmatter
+import markdown
+import pygments
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+from data.highlight import CachedHighlightExtension
+
+# Code highlighting options ('codehilite' config, see data/highlight.py)
+HIGHLIGHT_CONFIG = {
+    'css_class': 'highlight',
+    'linenums': False,
+}
+MARKDOWN_EXTENSIONS = ['tables', 'toc']
+
+# Everything that affects rendered output (part of the compiled-content cache key)
+RENDERER_CONFIG = {
+    'extensions': MARKDOWN_EXTENSIONS,
+    'highlight': HIGHLIGHT_CONFIG,
+    'highlighter': 'cached-v1',
+    'metadata': 'toc-stats-v1',
+    'markdown': markdown.__version__,
+    'pygments': pygments.__version__,
+}
+
+
+class StripTitleTreeprocessor(Treeprocessor):
+    """Remove the document's leading <h1> (it is rendered as the page title)."""
+
+    def run(self, root: etree.Element) -> None:
+        if len(root) and root[0].tag == 'h1':
+            root.remove(root[0])
+
+
+class StripTitleExtension(Extension):
+    def extendMarkdown(self, md: markdown.Markdown) -> None:
+        # Before 'toc' (priority 5) so the title is not part of the TOC
+        md.treeprocessors.register(StripTitleTreeprocessor(md), 'strip_title', 25)
+
+
+# One processor per (thread, strip_title) pair
+_pool = threading.local()
+
+
+def get_markdown_processor(strip_title: bool = False) -> markdown.Markdown:
+    """Get this thread's configured markdown processor, reset for a new document."""
+    processors = getattr(_pool, 'processors', None)
+    if processors is None:
+        processors = _pool.processors = {}
+
+    md = processors.get(strip_title)
+    if md is None:
+        extensions = [CachedHighlightExtension(**HIGHLIGHT_CONFIG), *MARKDOWN_EXTENSIONS]
+        if strip_title:
+            extensions.append(StripTitleExtension())
+        md = processors[strip_title] = markdown.Markdown(extensions=extensions)
+    return md.reset()
+
+
+def render_markdown(content: str, strip_title: bool = False) -> str:
+    """Render markdown content to HTML."""
+    return get_markdown_processor(strip_title).convert(content)
+
+
+def _toc_entry(token: Dict) -> Dict:
+    """Keep only what pages need from a 'toc' extension token."""
+    return {
+        'id': token['id'],
+        'name': token['name'],
+        'level': token['level'],
+        'children': [_toc_entry(child) for child in token['children']],
+    }
+
+
+def _anchors(toc: List[Dict]) -> List[str]:
+    return [anchor for entry in toc for anchor in [entry['id'], *_anchors(entry['children'])]]
+
+
+def render_document(filepath: Path) -> Dict:
+    """
+    Render the markdown body of a content file, without its leading h1.
+
+    Returns:
+        {'html': ..., 'toc': heading tree [{id, name, level, children}],
+         'anchors': heading ids in document order}
+    """
+    document = frontmatter.load(filepath)
+    md = get_markdown_processor(strip_title=True)
+    html = md.convert(document.content)
+    toc = [_toc_entry(token) for token in md.toc_tokens]
+    return {'html': html, 'toc': toc, 'anchors': _anchors(toc)}
+
+
+# Average silent reading speed used for 'N min' estimates
+WORDS_PER_MINUTE = 200
+
+_FENCE_RE = re.compile(r'^(`{3,}|~{3,}).*?^\1', re.M | re.S)
+_LINK_TARGET_RE = re.compile(r'\]\([^)]*\)')
+_WORD_RE = re.compile(r'\w+')
+
+
+def text_stats(content: str) -> Dict[str, int]:
+    """
+    Word count and reading time (minutes, at least 1) of a markdown body.
+
+    Fenced code blocks and link targets are not counted as prose.
+    """
+    prose = _LINK_TARGET_RE.sub(']', _FENCE_RE.sub(' ', content))
+    words = len(_WORD_RE.findall(prose))
+    return {'word_count': words, 'reading_time': max(1, round(words / WORDS_PER_MINUTE))}
+
+
+def render_snippet(content: str) -> str:
+    """Render an indented inline markdown snippet (e.g. from Python source)."""
+    return render_markdown(dedent(content).strip())
@@ -0,0 +1,240 @@
+"""
+Full-text search over blog posts and projects.
+
+One in-memory inverted index per language, scored with BM25 over
+weighted fields (title, tags, excerpt, body text). Text is accent-folded
+(canción -> cancion), stop words are dropped and words are reduced with a
+light per-language suffix stemmer, at index and at query time. The last
+query word also matches as a prefix, for search-as-you-type.
+
+Indexes are built on first search and rebuilt after any content reload
+(they are tagged with content_store.content_version()); per-document
+analysis is reused for records that did not change, so a rebuild only
+re-tokenises the edited files.
+"""
+
+import re
+import math
+import html
+import bisect
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from data.content_store import content_version
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights (a title hit counts as three body hits)
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'tags': 2.5,
+    'excerpt': 1.5,
+    'body': 1.0,
+}
+
+# Vocabulary terms a trailing partial word may expand to
+MAX_PREFIX_EXPANSIONS = 20
+
+STOP_WORDS = {
+    'es': set('''
+        a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el ella
+        ellas ellos en entre era eran es esa esas ese eso esos esta estan estas este esto estos fue fueron ha
+        han hasta hay la las le les lo los mas me mi mis mucho muy ni no nos o os otra otro para pero poco por
+        porque que quien se sea ser si sin sobre su sus tambien te tiene tienen todo todos tu tus un una unas
+        uno unos y ya yo
+    '''.split()),
+    'en': set('''
+        a about after all also an and any are as at be because been but by can could did do does for from had
+        has have he her his how i if in into is it its just more most my no not of on or our out over she so
+        some such than that the their them then there these they this those through to too up us was we were
+        what when where which while who will with would you your
+    '''.split()),
+}
+
+# Suffixes stripped by the light stemmers, longest first
+_SUFFIXES = {
+    'es': ('amientos', 'imientos', 'amiento', 'imiento', 'aciones', 'uciones', 'idades', 'acion', 'ucion',
+           'mente', 'idad', 'ismos', 'istas', 'ables', 'ibles', 'ismo', 'ista', 'able', 'ible',
+           'ados', 'idos', 'adas', 'idas', 'osos', 'osas', 'ado', 'ido', 'ada', 'ida', 'oso', 'osa',
+           'es', 'os', 'as', 's', 'a', 'o', 'e'),
+    'en': ('ational', 'ization', 'fulness', 'iveness', 'ations', 'ation', 'ments', 'ment', 'ness',
+           'ings', 'ing', 'edly', 'ies', 'ed', 'ly', 'es', 's', 'e'),
+}
+MIN_STEM_LENGTH = 3
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_PRE_RE = re.compile(r'<pre\b.*?</pre>', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents (NFKD without combining marks)."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(word: str, lang: str) -> str:
+    """Light suffix-stripping stemmer (one suffix, keeps at least 3 letters)."""
+    for suffix in _SUFFIXES.get(lang, ()):
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def analyze(text: str, lang: str) -> List[str]:
+    """Text -> folded, stop-word-filtered, stemmed terms."""
+    stop_words = STOP_WORDS.get(lang, set())
+    return [stem(word, lang) for word in _WORD_RE.findall(fold(text)) if word not in stop_words]
+
+
+def html_text(markup: str) -> str:
+    """Visible prose of rendered HTML (code blocks left out)."""
+    return html.unescape(_TAG_RE.sub(' ', _PRE_RE.sub(' ', markup)))
+
+
+@dataclass
+class SearchIndex:
+    docs: List[Dict] = field(default_factory=list)
+    # term -> [(doc id, weighted term frequency)]
+    postings: Dict[str, List[Tuple[int, float]]] = field(default_factory=dict)
+    doc_lengths: List[float] = field(default_factory=list)
+    avg_length: float = 1.0
+    idf: Dict[str, float] = field(default_factory=dict)
+    vocabulary: List[str] = field(default_factory=list)
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query: str, lang: str, limit: int = 10) -> List[Tuple[float, Dict]]:
+        """Top documents for a query, best first."""
+        words = [w for w in _WORD_RE.findall(fold(query)) if w not in STOP_WORDS.get(lang, set())]
+        if not words:
+            return []
+
+        terms = {stem(word, lang) for word in words}
+        # Search-as-you-type: the last word may be incomplete
+        if not query[-1:].isspace():
+            terms.update(self._expand_prefix(words[-1]))
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+        best = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(score, self.docs[doc_id]) for doc_id, score in best]
+
+
+# (lang, kind, filepath) -> (record, summary, weighted term frequencies, length)
+_analysis: Dict[Tuple[str, str, str], Tuple[Dict, Dict, Dict[str, float], float]] = {}
+# lang -> (content version, index)
+_indexes: Dict[str, Tuple[int, SearchIndex]] = {}
+_lock = threading.Lock()
+
+
+def _fields(kind: str, record: Dict) -> Dict[str, str]:
+    if kind == 'blog':
+        tags = [*record.get('tags', []), record.get('category') or '']
+    else:
+        tags = record.get('technologies', [])
+    return {
+        'title': record.get('title', ''),
+        'tags': ' '.join(str(tag) for tag in tags),
+        'excerpt': record.get('excerpt') or record.get('description', ''),
+        'body': html_text(record['html']),
+    }
+
+
+def _analysis_key(kind: str, record: Dict, lang: str) -> Tuple[str, str, str]:
+    return (lang, kind, str(record.get('filepath', record['slug'])))
+
+
+def _analyze_record(kind: str, record: Dict, lang: str) -> Tuple[Dict, Dict[str, float], float]:
+    """Summary, weighted term frequencies and weighted length of one record (cached)."""
+    key = _analysis_key(kind, record, lang)
+    cached = _analysis.get(key)
+    if cached is not None and cached[0] is record:
+        return cached[1:]
+
+    frequencies: Dict[str, float] = {}
+    length = 0.0
+    for name, text in _fields(kind, record).items():
+        weight = FIELD_WEIGHTS[name]
+        terms = analyze(text, lang)
+        length += weight * len(terms)
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0.0) + weight
+
+    summary = {
+        'kind': kind,
+        'slug': record['slug'],
+        'title': record.get('title', ''),
+        'excerpt': record.get('excerpt') or record.get('description', ''),
+        'url': f"/{'blog' if kind == 'blog' else 'projects'}/{record['slug']}",
+    }
+    _analysis[key] = (record, summary, frequencies, length)
+    return summary, frequencies, length
+
+
+def build_index(lang: str) -> SearchIndex:
+    """Index every post and project of a language."""
+    from data.blog_loader import get_all_posts
+    from data.project_loader import get_all_projects
+
+    records = [('blog', post) for post in get_all_posts(lang)]
+    records += [('project', project) for project in get_all_projects(lang)]
+
+    index = SearchIndex()
+    for doc_id, (kind, record) in enumerate(records):
+        summary, frequencies, length = _analyze_record(kind, record, lang)
+        index.docs.append(summary)
+        index.doc_lengths.append(length)
+        for term, tf in frequencies.items():
+            index.postings.setdefault(term, []).append((doc_id, tf))
+
+    # Drop records that were deleted or moved since the last build
+    current = {_analysis_key(kind, record, lang) for kind, record in records}
+    for key in [key for key in _analysis if key[0] == lang and key not in current]:
+        del _analysis[key]
+
+    total = len(index.docs)
+    index.avg_length = (sum(index.doc_lengths) / total) if total else 1.0
+    index.idf = {term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+                 for term, docs in index.postings.items()}
+    index.vocabulary = sorted(index.postings)
+    return index
+
+
+def get_index(lang: str) -> SearchIndex:
+    """Search index for a language (built on first use and after reloads)."""
+    version = content_version()
+    entry = _indexes.get(lang)
+    if entry is None or entry[0] != version:
+        with _lock:
+            entry = _indexes.get(lang)
+            if entry is None or entry[0] != version:
+                entry = _indexes[lang] = (version, build_index(lang))
+    return entry[1]
+
+
+def search(query: str, lang: Optional[str] = None, limit: int = 10) -> List[Tuple[float, Dict]]:
+    """Search posts and projects of a language (defaults to the current one)."""
+    if lang is None:
+        from services.i18n import get_language
+        lang = get_language()
+    return get_index(lang).search(query, lang, limit)
+
@@ -0,0 +1,80 @@
+"""
+Training data for the contact form spam filter (services/spam.py).
+
+Add real messages that got through (SPAM) or were held by mistake (HAM);
+the model is retrained from this module when the process starts. Kept as
+Python rather than YAML so the static file route never serves it.
+"""
+
+# Each hit adds a fixed weight on top of the naive-Bayes score
+KEYWORDS = [
+    'viagra',
+    'cialis',
+    'casino',
+    'betting',
+    'forex',
+    'crypto',
+    'bitcoin',
+    'backlinks',
+    'seo',
+    'guest post',
+    'loan',
+    'escort',
+    'porn',
+    'investment opportunity',
+    'prestamo',
+]
+
+SPAM = [
+    'Hi, I can bring your website to the first page of Google. We offer cheap SEO services and high quality backlinks. Reply for a free audit.',
+    'Dear Sir/Madam, we are offering guest post opportunities on high DA websites. Price starts at $50 per post.',
+    'Earn $5000 per week from home!!! Crypto trading bot with guaranteed profit. Visit http://bit.ly/xxxx now',
+    'Bitcoin investment opportunity, double your money in 7 days. Contact our manager on WhatsApp +1 555 0100',
+    'Cheap viagra and cialis online, no prescription needed, fast worldwide delivery http://pharma.example',
+    'Best online casino bonus 200% on first deposit. Play now and win big http://casino.example',
+    'Hello, your website has errors and is losing customers. Our team can redesign it for only $199. Reply YES.',
+    'We provide website traffic: 10,000 real visitors for $20. Boost your rankings today. http://traffic.example',
+    'Get a business loan approved in 24 hours, no credit check, low interest. Apply now http://loans.example',
+    'I am a lawyer representing a deceased client with 10.5 million USD unclaimed funds, contact me urgently.',
+    'FREE followers and likes for Instagram, TikTok and YouTube. Cheap packages, buy now http://smm.example',
+    'Hot singles in your area want to meet you tonight http://dating.example',
+    'Congratulations! You have won an iPhone. Click the link to claim your prize http://prize.example',
+    'Looking for app development? Our offshore team builds apps at the lowest price. Check our portfolio http://dev.example http://dev2.example',
+    'Forex signals with 95% accuracy, join our Telegram channel for daily profits',
+    'Buy cheap email lists, 1 million verified leads for your marketing campaign',
+    'Hola, ofrecemos servicios SEO baratos y backlinks de calidad para posicionar tu web en Google. Escríbenos por WhatsApp.',
+    'Gana dinero desde casa con criptomonedas, ganancias garantizadas cada semana. Entra aquí http://cripto.example',
+    'Préstamo rápido sin aval ni historial crediticio, aprobado en 24 horas. Solicítalo ya http://prestamos.example',
+    'Promoción exclusiva: compra seguidores reales para Instagram al mejor precio del mercado',
+    'Estimado, su sitio web tiene errores graves y pierde clientes. Lo rediseñamos por solo 99 dólares.',
+    'Felicidades, ha ganado un premio. Haga clic en el enlace para reclamarlo http://premio.example',
+    'Invierte en bitcoin con nuestro bot de trading automático y duplica tu inversión en una semana',
+    'Casino online con bono de bienvenida del 200%, apuestas deportivas y tragamonedas http://apuestas.example',
+]
+
+HAM = [
+    "Hi Esteban, I read your post about HTMX vs SPAs and I'd love to chat about a project for our company.",
+    'Hello, we are looking for a Python developer for a six month contract. Are you available to talk this week?',
+    'Great article on multi-tenant Django. How do you handle migrations across tenants?',
+    "Hi, I'm a recruiter at a fintech startup. Your experience with distributed systems looks like a good fit for a senior role.",
+    'Thanks for the FastHTML introduction, it helped me a lot. Do you have the code of the example on GitHub?',
+    "Hey! I'd like to collaborate on an open source project with FastHTML and HTMX. Let me know if you're interested.",
+    'We need help integrating electronic invoicing with the SII for our store. Could you send me a quote?',
+    'Hi, quick question about your transformers post: which model did you use for the Spanish classification task?',
+    'Hello, I found a small typo in your blog post about facturacion electronica, in the second code example.',
+    'Would you be open to giving a talk at our Python meetup next month?',
+    "I saw your portfolio and I'm impressed with the architecture work. Can we schedule a call?",
+    'We are building a SaaS for clinics and need someone with Django and PostgreSQL experience. What are your rates?',
+    'Hola Esteban, leí tu artículo sobre HTMX y me gustaría conversar sobre un proyecto para mi empresa.',
+    'Hola, buscamos un desarrollador Python para un proyecto de seis meses. ¿Tienes disponibilidad?',
+    'Excelente artículo sobre facturación electrónica con el SII. ¿Cómo manejas los certificados digitales?',
+    'Hola, soy reclutadora en una startup y tu experiencia en sistemas distribuidos encaja con el puesto.',
+    'Gracias por la introducción a FastHTML, me sirvió mucho. ¿Tienes el código del ejemplo en GitHub?',
+    'Necesitamos ayuda para integrar nuestro sistema con la API del SII. ¿Podrías enviarme una cotización?',
+    '¿Te interesaría dar una charla en nuestro meetup de Python el próximo mes?',
+    'Hola, vi tu portafolio y me gustó mucho el trabajo de arquitectura. ¿Podemos agendar una llamada?',
+    'Estamos desarrollando un sistema para clínicas con Django y PostgreSQL, ¿cuáles son tus tarifas?',
+    'Encontré un pequeño error en el artículo de transformers, en el segundo bloque de código.',
+    'Me gustaría colaborar contigo en un proyecto open source con machine learning.',
+    'Hola, ¿haces proyectos freelance de desarrollo web? Tenemos una tienda que necesita una renovación.',
+]
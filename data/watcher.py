@@ -0,0 +1,241 @@
+"""
+Content hot reload.
+
+Watches content/{lang}/blog and content/{lang}/projects and recompiles
+only the markdown files that were added, changed or deleted, swapping the
+result into the loaders' indexes (see ContentStore.update). Changes to
+locales/*.yml reload the translations, and edits to data/content.py are
+applied in place. All of them notify content_store subscribers (e.g. the
+page and fragment caches).
+
+Uses `watchfiles` (inotify on Linux) when installed, otherwise falls back
+to polling file mtimes.
+
+Settings (.env):
+    CONTENT_WATCH=false            # Disable hot reload
+    CONTENT_WATCH_INTERVAL=2       # Polling interval in seconds
+"""
+
+import os
+import atexit
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import data.content as site_content
+from data.blog_loader import CONTENT_DIR, post_store
+from data.content_store import notify
+from data.project_loader import project_store
+from services.i18n import LOCALES_PATH, reload_translations
+
+WATCH_INTERVAL = float(os.getenv('CONTENT_WATCH_INTERVAL', 2))
+
+# Content folder name -> store
+_STORES = {
+    'blog': post_store,
+    'projects': project_store,
+}
+WATCHED_SUFFIXES = ('.md', '.yml')
+SITE_CONTENT_FILE = Path(site_content.__file__).resolve()
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _classify(path: Path) -> Optional[Tuple[str, str]]:
+    """Map a file to (lang, folder) if it is a watched markdown, locale or site data file."""
+    if path.resolve() == SITE_CONTENT_FILE:
+        return '', 'site'
+    if path.suffix == '.yml' and path.parent == LOCALES_PATH:
+        return path.stem, 'locales'
+    if path.suffix != '.md':
+        return None
+    try:
+        parts = path.relative_to(CONTENT_DIR).parts
+    except ValueError:
+        return None
+    if len(parts) < 3 or parts[1] not in _STORES:
+        return None
+    return parts[0], parts[1]
+
+
+def _classify_dir(path: Path) -> Optional[Tuple[str, str]]:
+    """Map a (possibly deleted) directory inside a content tree to (lang, folder)."""
+    if path.suffix in WATCHED_SUFFIXES or path.is_file():
+        return None
+    try:
+        parts = path.relative_to(CONTENT_DIR).parts
+    except ValueError:
+        return None
+    if len(parts) < 3 or parts[1] not in _STORES:
+        return None
+    return parts[0], parts[1]
+
+
+def rescan(lang: str, folder: str) -> Tuple[List[Path], List[Path]]:
+    """
+    (added, removed) markdown files of a content tree compared to its index.
+
+    Renaming or moving a directory only produces events for the directory
+    itself, so the files under it are found by listing the tree again.
+    """
+    store = _STORES[folder]
+    on_disk = {str(path): path for path in store.list_files(lang)}
+    indexed = {item['filepath'] for item in store.get(lang).items}
+    added = [path for name, path in on_disk.items() if name not in indexed]
+    removed = [Path(name) for name in indexed if name not in on_disk]
+    return added, removed
+
+
+def reload_site_content() -> None:
+    """
+    Re-run data/content.py and update its dicts and lists in place.
+
+    Components import these by name (`from data.content import
+    hero_content`), so the existing objects are mutated rather than
+    replaced. Dicts get the new items in a single update() and only then
+    lose the keys that were removed, so a concurrent request never sees
+    them empty.
+    """
+    namespace = {'__name__': site_content.__name__, '__file__': site_content.__file__}
+    exec(compile(SITE_CONTENT_FILE.read_text(encoding='utf-8'), str(SITE_CONTENT_FILE), 'exec'), namespace)
+    for name, value in namespace.items():
+        if name.startswith('__'):
+            continue
+        current = getattr(site_content, name, None)
+        if isinstance(current, dict) and isinstance(value, dict):
+            current.update(value)
+            for stale in current.keys() - value.keys():
+                current.pop(stale, None)
+        elif isinstance(current, list) and isinstance(value, list):
+            current[:] = value
+        else:
+            setattr(site_content, name, value)
+
+
+def apply_changes(changed: Iterable[Path], removed: Iterable[Path]) -> None:
+    """Group file changes by (lang, folder) and patch the matching stores."""
+    batches: Dict[Tuple[str, str], Tuple[List[Path], List[Path]]] = {}
+    for path in changed:
+        key = _classify(path)
+        if key:
+            batches.setdefault(key, ([], []))[0].append(path)
+    for path in removed:
+        key = _classify(path)
+        if key:
+            batches.setdefault(key, ([], []))[1].append(path)
+
+    for (lang, folder), (changed_paths, removed_paths) in batches.items():
+        if folder == 'site':
+            if changed_paths:
+                print("[watcher] Reloading data/content.py")
+                try:
+                    reload_site_content()
+                except Exception as e:
+                    print(f"[watcher] Reload failed for data/content.py: {e}")
+                    continue
+                notify('site', lang)
+            continue
+        if folder == 'locales':
+            print(f"[watcher] Reloading translations ({lang})")
+            reload_translations()
+            notify('locale', lang)
+            continue
+        print(f"[watcher] Reloading {folder}/{lang}: "
+              f"{len(changed_paths)} changed, {len(removed_paths)} removed")
+        try:
+            _STORES[folder].update(lang, changed_paths, removed_paths)
+        except Exception as e:
+            print(f"[watcher] Reload failed for {folder}/{lang}: {e}")
+
+
+def _watch_dirs(langs: Iterable[str]) -> List[Path]:
+    dirs = [CONTENT_DIR / lang / folder for lang in langs for folder in _STORES]
+    for path in dirs:
+        path.mkdir(parents=True, exist_ok=True)
+    return dirs + [LOCALES_PATH, SITE_CONTENT_FILE]
+
+
+def _snapshot(dirs: List[Path]) -> Dict[Path, int]:
+    snapshot = {}
+    for directory in dirs:
+        for path in ([directory] if directory.is_file() else directory.rglob('*')):
+            if path.suffix not in WATCHED_SUFFIXES and path != SITE_CONTENT_FILE:
+                continue
+            try:
+                snapshot[path] = path.stat().st_mtime_ns
+            except OSError:
+                pass
+    return snapshot
+
+
+def _poll(dirs: List[Path]) -> None:
+    """mtime polling fallback."""
+    previous = _snapshot(dirs)
+    while not _stop.wait(WATCH_INTERVAL):
+        current = _snapshot(dirs)
+        changed = [p for p, mtime in current.items() if previous.get(p) != mtime]
+        removed = [p for p in previous if p not in current]
+        if changed or removed:
+            apply_changes(changed, removed)
+        previous = current
+
+
+def _notify(dirs: List[Path]) -> None:
+    """Event-driven watching through watchfiles (inotify on Linux)."""
+    import watchfiles
+
+    for events in watchfiles.watch(*dirs, stop_event=_stop, raise_interrupt=False):
+        changed: Set[Path] = set()
+        removed: Set[Path] = set()
+        rescans: Set[Tuple[str, str]] = set()
+        for change, raw_path in events:
+            path = Path(raw_path)
+            tree = _classify_dir(path)
+            if tree:
+                rescans.add(tree)
+                continue
+            if change == watchfiles.Change.deleted:
+                removed.add(path)
+                changed.discard(path)
+            else:
+                changed.add(path)
+                removed.discard(path)
+        for lang, folder in rescans:
+            added, gone = rescan(lang, folder)
+            changed.update(added)
+            removed.update(gone)
+        apply_changes(changed, removed)
+
+
+def start_watcher(langs: Optional[Iterable[str]] = None) -> threading.Thread:
+    """Start watching content in a daemon thread (idempotent per process)."""
+    global _thread
+    from services.i18n import SUPPORTED_LANGUAGES
+
+    if _thread is not None and _thread.is_alive():
+        return _thread
+
+    dirs = _watch_dirs(langs or SUPPORTED_LANGUAGES)
+    try:
+        import watchfiles  # noqa: F401
+        target, mode = _notify, 'inotify'
+    except ImportError:
+        target, mode = _poll, f'polling every {WATCH_INTERVAL:g}s'
+
+    _stop.clear()
+    _thread = threading.Thread(target=target, args=(dirs,), name='content-watcher', daemon=True)
+    _thread.start()
+    print(f"[watcher] Watching content ({mode})")
+    return _thread
+
+
+def stop_watcher() -> None:
+    """Stop the watcher thread."""
+    _stop.set()
+    if _thread is not None and _thread is not threading.current_thread():
+        _thread.join(timeout=1)
+
+
+# Let the thread leave the native watch loop before the interpreter exits
+atexit.register(stop_watcher)
@@ -1,7 +1,6 @@
 from fasthtml.common import *
-from starlette.responses import FileResponse, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from pathlib import Path
+from starlette.requests import cookie_parser
+from urllib.parse import parse_qsl
 from dotenv import load_dotenv
 import os
 
@@ -22,10 +21,25 @@ from components.blog import BlogSection
 from components.contact import Contact
 from components.footer import Footer
 from data.content import site_config
+from data.compiler import preload_content
+from data.watcher import start_watcher
 from services.i18n import set_language, detect_language_from_header, get_language, SUPPORTED_LANGUAGES
+from services.page_cache import PageCacheMiddleware
+from services.assets import static_response
+from services.outbox import start_worker as start_outbox_worker
 
-# Get the absolute path to the static folder
-STATIC_PATH = Path(__file__).resolve().parent / 'static'
+# Compile all content up front (in parallel) so the first request after a
+# deploy doesn't pay for markdown + syntax highlighting
+if os.getenv('CONTENT_PRELOAD', 'true').lower() != 'false':
+    preload_content()
+
+# Hot reload: recompile only the markdown files that change on disk
+if os.getenv('CONTENT_WATCH', 'true').lower() != 'false':
+    start_watcher()
+
+# Background contact email delivery (see services/outbox.py)
+if os.getenv('OUTBOX_WORKER', 'true').lower() != 'false':
+    start_outbox_worker()
 
 app, rt = fast_app(
     pico=False,
@@ -33,39 +47,54 @@ app, rt = fast_app(
 )
 
 
-# Language detection middleware
-class LanguageMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        # Priority: 1) ?lang= param, 2) cookie, 3) Accept-Language header
-        lang = request.query_params.get('lang')
+# Language detection middleware (pure ASGI: runs on every request, static files included)
+class LanguageMiddleware:
+    COOKIE = f'lang={{}}; Max-Age={60*60*24*365}; Path=/; SameSite=lax'  # 1 year
 
-        if not lang or lang not in SUPPORTED_LANGUAGES:
-            lang = request.cookies.get('lang')
+    def __init__(self, app):
+        self.app = app
 
-        if not lang or lang not in SUPPORTED_LANGUAGES:
-            accept_lang = request.headers.get('accept-language')
-            lang = detect_language_from_header(accept_lang)
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        # Priority: 1) ?lang= param, 2) cookie, 3) Accept-Language header
+        query = scope.get('query_string', b'')
+        query_lang = dict(parse_qsl(query.decode('latin-1'))).get('lang') if b'lang=' in query else None
+        lang = query_lang if query_lang in SUPPORTED_LANGUAGES else None
+
+        if lang is None:
+            headers = dict(scope['headers'])
+            cookie = headers.get(b'cookie')
+            if cookie and b'lang=' in cookie:
+                lang = cookie_parser(cookie.decode('latin-1')).get('lang')
+            if lang not in SUPPORTED_LANGUAGES:
+                accept_lang = headers.get(b'accept-language')
+                lang = detect_language_from_header(accept_lang.decode('latin-1') if accept_lang else None)
 
         set_language(lang)
 
-        response = await call_next(request)
+        if query_lang != lang:
+            return await self.app(scope, receive, send)
 
         # Set cookie if lang was specified in query param
-        if request.query_params.get('lang') in SUPPORTED_LANGUAGES:
-            response.set_cookie('lang', lang, max_age=60*60*24*365)  # 1 year
+        async def send_with_cookie(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', []),
+                                      (b'set-cookie', self.COOKIE.format(lang).encode('latin-1'))]
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_cookie)
 
 
+# Added first so it runs inside LanguageMiddleware (language already resolved)
+app.add_middleware(PageCacheMiddleware)
 app.add_middleware(LanguageMiddleware)
 
-# Explicit route for static files
+# Explicit route for static files (.br/.gz variants, immutable hashed URLs, 304s)
 @rt('/static/{path:path}')
-async def get(path: str):
-    file_path = STATIC_PATH / path
-    if file_path.exists():
-        return FileResponse(file_path)
-    return Response('Not found', status_code=404)
+async def get(path: str, request):
+    return static_response(path, request.headers)
 
 @rt('/')
 def get():
@@ -79,20 +108,31 @@ def get():
         BlogSection(),
         Contact(),
         Footer(),
-        title=site_config['title']
+        title=site_config['title'],
+        page_type='home'
     )
 
 # Blog routes
 @rt('/blog')
-def get():
+def get(request, page: int = 1, after: str = None):
     from pages.blog import blog_list
-    return blog_list()
+    return blog_list(page, after, fragment='hx-request' in request.headers)
 
 @rt('/blog/{slug}')
 def get(slug: str):
     from pages.blog import blog_post
     return blog_post(slug)
 
+@rt('/blog/tag/{tag}')
+def get(tag: str):
+    from pages.blog import blog_tag
+    return blog_tag(tag)
+
+@rt('/blog/category/{category}')
+def get(category: str):
+    from pages.blog import blog_category
+    return blog_category(category)
+
 # Project routes
 @rt('/projects')
 def get():
@@ -104,10 +144,26 @@ def get(slug: str):
     from pages.projects import project_detail
     return project_detail(slug)
 
+@rt('/projects/tech/{tech}')
+def get(tech: str):
+    from pages.projects import projects_by_tech
+    return projects_by_tech(tech)
+
+# Search (full page, or the result list for HTMX live search)
+@rt('/search')
+def get(request, q: str = ''):
+    from pages.search import search_page
+    return search_page(q, fragment='hx-request' in request.headers)
+
 # Contact form handler
+# Sync handler: the outbox insert runs in the threadpool, delivery in the outbox thread
 @rt('/contact')
-async def post(name: str, email: str, message: str):
-    from services.email import send_contact_email, ContactMessage
+def post(request, name: str, email: str, message: str, website: str = '', elapsed: str = ''):
+    import math
+    from services.email import ContactMessage
+    from services.outbox import enqueue
+    from services.rate_limit import check_contact
+    from services.spam import classify
     from services.i18n import t
 
     # Basic validation
@@ -117,22 +173,58 @@ async def post(name: str, email: str, message: str):
             id='contact-form-response'
         )
 
-    # Send email
+    # Honeypot and fill time reject, the classifier quarantines; rejected bots still see the success message
+    verdict = classify(name, message, honeypot=website, elapsed_ms=float(elapsed) if elapsed.isdigit() else None)
+    if verdict == 'reject':
+        return Div(
+            P(t('contact.success'), cls='success-message'),
+            id='contact-form-response'
+        )
+
+    # Token buckets per client IP and per email address (shared by all workers)
+    retry_after = check_contact(request.client.host if request.client else None, email)
+    if retry_after:
+        seconds = math.ceil(retry_after)
+        body = to_xml(Div(
+            P(t('contact.error_rate', minutes=math.ceil(seconds / 60)), cls='error-message'),
+            id='contact-form-response'
+        ))
+        # HTMX only swaps 2xx responses; direct (bot) posts get a real 429
+        status = 200 if 'hx-request' in request.headers else 429
+        return HTMLResponse(body, status_code=status, headers={'Retry-After': str(seconds)})
+
+    # Queue the email (sent in the background, retried on failure)
     msg = ContactMessage(name=name.strip(), email=email.strip(), message=message.strip())
-    success, error = send_contact_email(msg)
 
-    if success:
+    if enqueue(msg, quarantine=verdict == 'quarantine') is not None:
         return Div(
             P(t('contact.success'), cls='success-message'),
             id='contact-form-response'
         )
     else:
-        # Log error but show friendly message
-        print(f"Email error: {error}")
         return Div(
             P(t('contact.error'), cls='error-message'),
             id='contact-form-response'
         )
 
+# Atom feed (current language, or ?lang=) and sitemap, answered with 304 when unchanged
+@rt('/feed.xml')
+def get(request):
+    from services.feeds import get_feed, document_response
+    response = document_response(get_feed(get_language()), request.headers)
+    if request.query_params.get('lang') not in SUPPORTED_LANGUAGES:
+        # Language picked by LanguageMiddleware from the cookie or Accept-Language
+        response.headers['Vary'] = 'Cookie, Accept-Language'
+    return response
+
+@rt('/sitemap.xml')
+def get(request):
+    from services.feeds import get_sitemap, document_response
+    return document_response(get_sitemap(), request.headers)
+
+# fast_app registers a catch-all `/{fname:path}.{ext:static}` file route
+# first, which would otherwise shadow /static/... and the .xml routes above
+app.routes.sort(key=lambda route: getattr(route, 'path', '') == '/{fname:path}.{ext:static}')
+
 if __name__ == "__main__":
     serve(host='0.0.0.0', port=PORT, reload=DEBUG)
@@ -0,0 +1,69 @@
+"""
+Build and maintenance commands.
+
+Usage:
+    python manage.py export [--out dist] [--lang es --lang en] [--workers N]
+    python manage.py assets
+    python manage.py outbox [--retry-dead] [--quarantined] [--release]
+"""
+
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def cmd_export(args):
+    from services.export import export_site
+    export_site(Path(args.out), langs=args.lang, workers=args.workers)
+
+
+def cmd_assets(args):
+    from services.assets import precompress, write_manifest
+    from services.critical_css import build_css
+    from services.images import build_images
+    build_images()
+    build_css()
+    precompress()
+    write_manifest()
+
+
+def cmd_outbox(args):
+    from services.outbox import counts, quarantined, release_quarantined, retry_dead
+    if args.quarantined:
+        for id_, msg in quarantined():
+            print(f"#{id_} {msg.name} <{msg.email}>\n{msg.message}\n")
+    if args.retry_dead:
+        print(f"[outbox] Queued {retry_dead()} dead-lettered messages again")
+    if args.release:
+        print(f"[outbox] Released {release_quarantined()} quarantined messages")
+    print(', '.join(f'{status}: {count}' for status, count in sorted(counts().items())) or '[outbox] Empty')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Portfolio build commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='Render every page to static HTML')
+    export.add_argument('--out', default='dist', help='Output directory (default: dist)')
+    export.add_argument('--lang', action='append', help='Language to export (repeatable, default: all)')
+    export.add_argument('--workers', type=int, help='Render processes (default: available cores)')
+    export.set_defaults(func=cmd_export)
+
+    assets = commands.add_parser('assets', help='Build responsive images and critical CSS, precompress static assets (.br/.gz) and write the fingerprint manifest')
+    assets.set_defaults(func=cmd_assets)
+
+    outbox = commands.add_parser('outbox', help='Show contact email outbox counts')
+    outbox.add_argument('--retry-dead', action='store_true', help='Queue dead-lettered messages again')
+    outbox.add_argument('--quarantined', action='store_true', help='Print messages held by the spam filter')
+    outbox.add_argument('--release', action='store_true', help='Send the quarantined messages')
+    outbox.set_defaults(func=cmd_outbox)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
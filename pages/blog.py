@@ -1,13 +1,46 @@
+import datetime
+from functools import lru_cache
 from fasthtml.common import *
+from starlette.responses import HTMLResponse
 from components.layout import Page, Navbar
 from components.footer import Footer
-from components.blog import BlogListCard
+from components.blog import BlogListCard, TagLink, CategoryLink, TableOfContents
+from components.search import SearchBox
 from data.content import site_config
-from data.blog_loader import get_all_posts, get_post_by_slug
+from data.content_store import subscribe
+from data.blog_loader import (get_posts_page, get_posts_after, get_post_by_slug, get_post_neighbours,
+                              get_posts_by_tag, get_posts_by_category)
+from services.i18n import get_language
 
-def blog_list():
-    """Blog listing page."""
-    posts = get_all_posts()
+def LoadMore(last_post):
+    """Infinite-scroll sentinel: swaps itself for the next page of cards when revealed."""
+    href = f"/blog?after={last_post['slug']}"
+    return Div(
+        A('Cargar más artículos', href=href, rel='next', cls='btn btn-secondary'),
+        hx_get=href,
+        hx_trigger='revealed',
+        hx_swap='outerHTML',
+        cls='blog-list-more'
+    )
+
+def blog_list(page: int = 1, after: str = None, fragment: bool = False):
+    """Blog listing page (?page=N or ?after=slug), or just the cards for HTMX requests."""
+    posts = get_posts_after(after) if after else get_posts_page(page)[0]
+
+    if not posts and (after or page != 1):
+        # Unknown cursor or page past the end
+        if fragment:
+            return HTMLResponse('')
+        body = _not_found_html(get_language(), datetime.date.today().year)
+        return HTMLResponse(body, status_code=404)
+
+    cards = [BlogListCard(post) for post in posts]
+    # Older posts left after this page (list is newest first)
+    if posts and get_post_neighbours(posts[-1]['slug'])[0]:
+        cards.append(LoadMore(posts[-1]))
+
+    if fragment:
+        return tuple(cards)
 
     return Page(
         Navbar(),
@@ -20,7 +53,37 @@ def blog_list():
                     cls='page-header'
                 ),
 
+                SearchBox(),
+
                 # Blog posts list
+                Div(
+                    *cards,
+                    cls='blog-list'
+                ),
+
+                cls='container'
+            ),
+            cls='blog-page'
+        ),
+        Footer(),
+        title=f'Blog | {site_config["name"]}',
+        page_type='blog'
+    )
+
+def _filtered_list(heading: str, description: str, posts):
+    """Listing of the posts of one tag or category."""
+    return Page(
+        Navbar(),
+        ft_hx('main',
+            Div(
+                # Page header
+                Div(
+                    A('← Volver al blog', href='/blog', cls='back-link'),
+                    H1(heading, cls='page-title'),
+                    P(description, cls='page-description'),
+                    cls='page-header'
+                ),
+
                 Div(
                     *[BlogListCard(post) for post in posts],
                     cls='blog-list'
@@ -31,28 +94,59 @@ def blog_list():
             cls='blog-page'
         ),
         Footer(),
-        title=f'Blog | {site_config["name"]}'
+        title=f'{heading} | Blog | {site_config["name"]}',
+        page_type='blog'
     )
 
+def blog_tag(tag: str):
+    """Posts with a tag (served from the precomputed tag index)."""
+    found = get_posts_by_tag(tag)
+    if found is None:
+        return HTMLResponse(_not_found_html(get_language(), datetime.date.today().year), status_code=404)
+    label, posts = found
+    return _filtered_list(f'#{label}', f'{len(posts)} artículo(s) con la etiqueta {label}.', posts)
+
+def blog_category(category: str):
+    """Posts in a category (served from the precomputed category index)."""
+    found = get_posts_by_category(category)
+    if found is None:
+        return HTMLResponse(_not_found_html(get_language(), datetime.date.today().year), status_code=404)
+    label, posts = found
+    return _filtered_list(label, f'{len(posts)} artículo(s) en la categoría {label}.', posts)
+
+@lru_cache(maxsize=8)
+def _not_found_html(lang: str, year: int) -> str:
+    """Pre-rendered not-found page (per language and footer year)."""
+    return to_xml(Page(
+        Navbar(),
+        ft_hx('main',
+            Div(
+                H1('Artículo no encontrado', cls='page-title'),
+                P('El artículo que buscas no existe.'),
+                A('Volver al blog', href='/blog', cls='btn btn-primary'),
+                cls='container not-found'
+            ),
+            cls='blog-page'
+        ),
+        Footer(),
+        title=f'No encontrado | {site_config["name"]}',
+        page_type='not-found'
+    ))
+
+# Navbar/Footer labels, site data and asset URLs change on reload
+subscribe(lambda kind, lang: _not_found_html.cache_clear())
+
 def blog_post(slug: str):
     """Individual blog post page."""
     post = get_post_by_slug(slug)
 
     if not post:
-        return Page(
-            Navbar(),
-            ft_hx('main',
-                Div(
-                    H1('Artículo no encontrado', cls='page-title'),
-                    P('El artículo que buscas no existe.'),
-                    A('Volver al blog', href='/blog', cls='btn btn-primary'),
-                    cls='container not-found'
-                ),
-                cls='blog-page'
-            ),
-            Footer(),
-            title=f'No encontrado | {site_config["name"]}'
-        )
+        # Unknown slugs (mostly bot scans) get a cached body, no rendering
+        body = _not_found_html(get_language(), datetime.date.today().year)
+        return HTMLResponse(body, status_code=404)
+
+    previous, following = get_post_neighbours(slug)
+    toc = TableOfContents(post['toc'])
 
     return Page(
         Navbar(),
@@ -61,15 +155,24 @@ def blog_post(slug: str):
                 # Post header
                 Div(
                     A('← Volver al blog', href='/blog', cls='back-link'),
-                    Time(post['date'], datetime=post['date'], cls='post-date'),
+                    Div(
+                        Time(post['date'], datetime=post['date']),
+                        Span('·', cls='separator'),
+                        Span(f"{post['reading_time']} min de lectura", cls='reading-time'),
+                        *([Span('·', cls='separator'), CategoryLink(post['category'])] if post.get('category') else []),
+                        cls='post-date'
+                    ),
                     H1(post['title'], cls='post-title'),
                     Div(
-                        *[Span(tag, cls='blog-tag') for tag in post.get('tags', [])],
+                        *[TagLink(tag) for tag in post.get('tags', [])],
                         cls='post-tags'
                     ),
                     cls='post-header'
                 ),
 
+                # Table of contents (compiled with the post)
+                toc,
+
                 # Post content (pre-rendered HTML from markdown)
                 Div(
                     NotStr(post['html']),
@@ -78,15 +181,18 @@ def blog_post(slug: str):
 
                 # Post footer
                 Div(
-                    A('← Artículo anterior', href='/blog', cls='post-nav-link'),
-                    A('Siguiente artículo →', href='/blog', cls='post-nav-link'),
+                    A('← Artículo anterior', href=f"/blog/{previous['slug']}", title=previous['title'], cls='post-nav-link')
+                        if previous else Span(),
+                    A('Siguiente artículo →', href=f"/blog/{following['slug']}", title=following['title'], cls='post-nav-link')
+                        if following else Span(),
                     cls='post-nav'
                 ),
 
-                cls='container post-container'
+                cls='container post-container' + (' has-toc' if toc else '')
             ),
             cls='blog-post-page'
         ),
         Footer(),
-        title=f'{post["title"]} | {site_config["name"]}'
+        title=f'{post["title"]} | {site_config["name"]}',
+        page_type='post'
     )
@@ -1,25 +1,57 @@
+import datetime
+from functools import lru_cache
 from fasthtml.common import *
+from starlette.responses import HTMLResponse
 from components.layout import Page, Navbar
 from components.footer import Footer
 from components.hero import SvgIcon
 from data.content import site_config
-from data.project_loader import get_all_projects, get_project_by_slug
+from data.content_store import subscribe
+from data.project_loader import get_all_projects, get_project_by_slug, get_projects_by_tech
+from services.i18n import get_language
+from components.images import ResponsiveImg
+from components.projects import TechLink
 
 
 def projects_list():
     """Projects listing page."""
-    projects = get_all_projects()
+    return _projects_page(
+        Div(
+            H1('Proyectos', cls='page-title'),
+            P('Sistemas y aplicaciones que he construido.', cls='page-description'),
+            cls='page-header'
+        ),
+        get_all_projects(),
+        title=f'Proyectos | {site_config["name"]}'
+    )
 
+
+def projects_by_tech(tech: str):
+    """Projects using a technology (served from the precomputed technology index)."""
+    found = get_projects_by_tech(tech)
+    if found is None:
+        return HTMLResponse(_not_found_html(get_language(), datetime.date.today().year), status_code=404)
+    label, projects = found
+    return _projects_page(
+        Div(
+            A('← Volver a proyectos', href='/projects', cls='back-link'),
+            H1(label, cls='page-title'),
+            P(f'{len(projects)} proyecto(s) construidos con {label}.', cls='page-description'),
+            cls='page-header'
+        ),
+        projects,
+        title=f'{label} | Proyectos | {site_config["name"]}'
+    )
+
+
+def _projects_page(header, projects, title: str):
+    """Projects grid page with the given header."""
     return Page(
         Navbar(),
         ft_hx('main',
             Div(
                 # Page header
-                Div(
-                    H1('Proyectos', cls='page-title'),
-                    P('Sistemas y aplicaciones que he construido.', cls='page-description'),
-                    cls='page-header'
-                ),
+                header,
 
                 # Projects grid
                 Div(
@@ -32,7 +64,8 @@ def projects_list():
             cls='projects-page'
         ),
         Footer(),
-        title=f'Proyectos | {site_config["name"]}'
+        title=title,
+        page_type='projects'
     )
 
 
@@ -42,7 +75,7 @@ def ProjectListCard(project):
         Div(
             # Image
             Div(
-                Img(src=project['image'], alt=project['title'], loading='lazy'),
+                ResponsiveImg(project['image'], alt=project['title'], sizes='(max-width: 768px) 100vw, 33vw'),
                 cls='project-list-image'
             ),
 
@@ -70,25 +103,37 @@ def ProjectListCard(project):
     )
 
 
+@lru_cache(maxsize=8)
+def _not_found_html(lang: str, year: int) -> str:
+    """Pre-rendered not-found page (per language and footer year)."""
+    return to_xml(Page(
+        Navbar(),
+        ft_hx('main',
+            Div(
+                H1('Proyecto no encontrado', cls='page-title'),
+                P('El proyecto que buscas no existe.'),
+                A('Ver todos los proyectos', href='/projects', cls='btn btn-primary'),
+                cls='container not-found'
+            ),
+            cls='projects-page'
+        ),
+        Footer(),
+        title=f'No encontrado | {site_config["name"]}',
+        page_type='not-found'
+    ))
+
+# Navbar/Footer labels, site data and asset URLs change on reload
+subscribe(lambda kind, lang: _not_found_html.cache_clear())
+
+
 def project_detail(slug: str):
     """Individual project page."""
     project = get_project_by_slug(slug)
 
     if not project:
-        return Page(
-            Navbar(),
-            ft_hx('main',
-                Div(
-                    H1('Proyecto no encontrado', cls='page-title'),
-                    P('El proyecto que buscas no existe.'),
-                    A('Ver todos los proyectos', href='/projects', cls='btn btn-primary'),
-                    cls='container not-found'
-                ),
-                cls='projects-page'
-            ),
-            Footer(),
-            title=f'No encontrado | {site_config["name"]}'
-        )
+        # Unknown slugs (mostly bot scans) get a cached body, no rendering
+        body = _not_found_html(get_language(), datetime.date.today().year)
+        return HTMLResponse(body, status_code=404)
 
     return Page(
         Navbar(),
@@ -105,7 +150,7 @@ def project_detail(slug: str):
 
                     # Technologies
                     Div(
-                        *[Span(tech, cls='tech-tag') for tech in project['technologies']],
+                        *[TechLink(tech) for tech in project['technologies']],
                         cls='project-tags'
                     ),
 
@@ -151,5 +196,6 @@ def project_detail(slug: str):
             cls='project-detail-page'
         ),
         Footer(),
-        title=f'{project["title"]} | {site_config["name"]}'
+        title=f'{project["title"]} | {site_config["name"]}',
+        page_type='project'
     )
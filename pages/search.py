@@ -0,0 +1,36 @@
+from fasthtml.common import *
+from components.layout import Page, Navbar
+from components.footer import Footer
+from components.search import SearchBox, SearchResults
+from data.content import site_config
+from data.search import search
+from services.i18n import t
+
+# Longest query accepted (longer input is truncated)
+MAX_QUERY_LENGTH = 200
+
+def search_page(q: str = '', fragment: bool = False):
+    """Search results page, or just the result list for HTMX live search."""
+    query = q[:MAX_QUERY_LENGTH]
+    results = search(query) if query.strip() else []
+
+    if fragment:
+        return SearchResults(query, results)
+
+    return Page(
+        Navbar(),
+        ft_hx('main',
+            Div(
+                Div(
+                    H1(t('search.title'), cls='page-title'),
+                    cls='page-header'
+                ),
+                SearchBox(query, SearchResults(query, results)),
+                cls='container'
+            ),
+            cls='search-page'
+        ),
+        Footer(),
+        title=f'{t("search.title")} | {site_config["name"]}',
+        page_type='search'
+    )
@@ -0,0 +1,279 @@
+"""
+Static asset serving and build steps.
+
+Precompression: `python manage.py assets` writes .br and .gz siblings next
+to every compressible file under static/ (CSS, JS, SVG, ...). The /static
+route then negotiates Accept-Encoding and serves the precompressed variant
+with the right Content-Encoding / Vary headers, so no CPU is spent
+compressing on each request.
+
+Brotli needs the optional `brotli` package; without it only .gz files are
+written and served.
+
+Fingerprinting: asset_url('css/main.css') returns a content-hashed URL
+(/static/css/main.3f9a1c2b7e.css). Hashed URLs are served with
+`Cache-Control: immutable` for a year; plain URLs are revalidated with
+ETag / Last-Modified and answered with 304 when unchanged. The build
+step writes the mapping to static/manifest.json, which asset_url reads
+instead of hashing files per process; with DEBUG=true, or for files the
+manifest does not list, URLs are hashed from the live files.
+"""
+
+import os
+import re
+import gzip
+import json
+import hashlib
+import mimetypes
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from starlette.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATIC_PATH = BASE_DIR / 'static'
+
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.mjs', '.svg', '.html', '.json', '.xml', '.txt', '.map', '.ico'}
+MIN_COMPRESS_SIZE = 1024
+
+# Content-Encoding -> sibling file suffix, in order of preference
+ENCODINGS: List[Tuple[str, str]] = [('br', '.br'), ('gzip', '.gz')]
+
+STATIC_URL = '/static/'
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 10
+# css/main.3f9a1c2b7e.css -> ('css/main', '3f9a1c2b7e', '.css')
+FINGERPRINT_RE = re.compile(rf'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?P<suffix>\.[^./]+)$')
+
+# Hash files on every change instead of trusting the built manifest
+LIVE_HASHING = os.getenv('DEBUG', 'false').lower() == 'true'
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output reproducible between builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress(root: Path = STATIC_PATH, min_size: int = MIN_COMPRESS_SIZE) -> Dict[str, int]:
+    """
+    Write .br/.gz siblings for compressible files under root.
+
+    Variants are only kept when smaller than the original, and are skipped
+    when already newer than their source.
+
+    Returns:
+        Counts of files written per encoding.
+    """
+    encodings = [(enc, suffix) for enc, suffix in ENCODINGS if enc != 'br' or brotli is not None]
+    written = {enc: 0 for enc, _ in encodings}
+
+    for path in sorted(root.rglob('*')):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        stat = path.stat()
+        if stat.st_size < min_size:
+            continue
+
+        data = None
+        for enc, suffix in encodings:
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime_ns >= stat.st_mtime_ns:
+                continue
+            data = data if data is not None else path.read_bytes()
+            compressed = _compress(data, enc)
+            if len(compressed) < len(data):
+                target.write_bytes(compressed)
+                written[enc] += 1
+            elif target.exists():
+                target.unlink()
+
+    if brotli is None:
+        print("[assets] brotli not installed, only gzip variants written")
+    print(f"[assets] Precompressed under {root}: " + ', '.join(f'{n} {enc}' for enc, n in written.items()))
+    return written
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    """Content hash of a file (cached per mtime/size)."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprint(name: str, root: Path = STATIC_PATH) -> Optional[str]:
+    """Hashed name for a file under root ('css/main.css' -> 'css/main.<hash>.css')."""
+    file_path = root / name
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    digest = _file_digest(str(file_path), stat.st_mtime_ns, stat.st_size)
+    stem, suffix = os.path.splitext(name)
+    return f'{stem}.{digest}{suffix}'
+
+
+def asset_url(name: str) -> str:
+    """
+    Content-hashed URL for a static asset.
+
+    Accepts a logical name ('css/main.css') or a plain static URL
+    ('/static/images/about.jpg'). Missing files keep their plain URL, and
+    external URLs ('https://...', '//cdn...', 'data:...') are returned as is.
+    """
+    if urlsplit(name).scheme or name.startswith('//'):
+        return name
+    logical = name[len(STATIC_URL):] if name.startswith(STATIC_URL) else name.lstrip('/')
+    hashed = None if LIVE_HASHING else load_manifest().get(logical)
+    if hashed is None:
+        hashed = fingerprint(logical)
+    return STATIC_URL + (hashed or logical)
+
+
+# (manifest mtime, mapping)
+_manifest: Tuple[Optional[int], Dict[str, str]] = (None, {})
+
+
+def load_manifest(root: Path = STATIC_PATH) -> Dict[str, str]:
+    """Built static/manifest.json (re-read when the file changes), or {} if not built."""
+    global _manifest
+    path = root / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    if _manifest[0] != mtime:
+        try:
+            _manifest = (mtime, json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, ValueError) as e:
+            print(f"[assets] Ignoring unreadable {path}: {e}")
+            _manifest = (mtime, {})
+    return _manifest[1]
+
+
+def build_manifest(root: Path = STATIC_PATH) -> Dict[str, str]:
+    """Map every asset under root to its fingerprinted name."""
+    manifest = {}
+    for path in sorted(root.rglob('*')):
+        if not path.is_file() or path.name == MANIFEST_NAME or path.suffix in ('.br', '.gz'):
+            continue
+        name = path.relative_to(root).as_posix()
+        manifest[name] = fingerprint(name, root)
+    return manifest
+
+
+def write_manifest(root: Path = STATIC_PATH) -> Dict[str, str]:
+    """Write static/manifest.json (logical name -> fingerprinted name)."""
+    manifest = build_manifest(root)
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    print(f"[assets] Wrote manifest with {len(manifest)} assets")
+    return manifest
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}, ignoring malformed q-values."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def resolve_static(path: str, root: Path = STATIC_PATH) -> Optional[Path]:
+    """Map a URL path to a file under root (None if missing or outside root)."""
+    file_path = (root / path).resolve()
+    if not file_path.is_relative_to(root.resolve()) or not file_path.is_file():
+        return None
+    return file_path
+
+
+def _resolve_fingerprinted(path: str, root: Path) -> Tuple[Optional[Path], bool]:
+    """
+    Resolve a possibly fingerprinted URL path.
+
+    Returns:
+        (file, immutable): immutable is True only when the URL's hash
+        matches the current file contents.
+    """
+    file_path = resolve_static(path, root)
+    if file_path is not None:
+        return file_path, False
+
+    match = FINGERPRINT_RE.match(path)
+    if not match:
+        return None, False
+    logical = match['stem'] + match['suffix']
+    file_path = resolve_static(logical, root)
+    if file_path is None:
+        return None, False
+    # An old hash still gets the current file, just without long-term caching
+    return file_path, fingerprint(logical, root) == path
+
+
+def not_modified(etag: str, last_modified: str, request_headers: Mapping[str, str]) -> bool:
+    """Whether a conditional request (If-None-Match / If-Modified-Since) can get a 304."""
+    if_none_match = request_headers.get('if-none-match')
+    if if_none_match:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+    if_modified_since = request_headers.get('if-modified-since')
+    return bool(if_modified_since) and if_modified_since == last_modified
+
+
+def static_response(path: str, request_headers: Optional[Mapping[str, str]] = None,
+                    root: Path = STATIC_PATH) -> Response:
+    """
+    Serve a static file.
+
+    Prefers a precompressed variant the client accepts, serves content-hashed
+    URLs as immutable and answers conditional requests with 304.
+    """
+    request_headers = request_headers or {}
+    file_path, immutable = _resolve_fingerprinted(path, root)
+    if file_path is None:
+        return Response('Not found', status_code=404)
+
+    headers = {'Cache-Control': IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL}
+    media_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+    served = file_path
+
+    if file_path.suffix in COMPRESSIBLE_SUFFIXES:
+        headers['Vary'] = 'Accept-Encoding'
+        accepted = accepted_encodings(request_headers.get('accept-encoding'))
+        source_mtime = file_path.stat().st_mtime_ns
+        for enc, suffix in ENCODINGS:
+            if accepted.get(enc, accepted.get('*', 0)) <= 0:
+                continue
+            variant = file_path.with_name(file_path.name + suffix)
+            if variant.is_file() and variant.stat().st_mtime_ns >= source_mtime:
+                served = variant
+                headers['Content-Encoding'] = enc
+                break
+
+    response = FileResponse(served, media_type=media_type, headers=headers, stat_result=served.stat())
+    if not_modified(response.headers['etag'], response.headers['last-modified'], request_headers):
+        keep = ('etag', 'last-modified', 'cache-control', 'vary')
+        return Response(status_code=304, headers={k: v for k, v in response.headers.items() if k in keep})
+    return response
@@ -0,0 +1,418 @@
+"""
+Critical CSS build step.
+
+main.css and theme-geometric.css are ~115 KB of render-blocking CSS, most
+of it for selectors no page emits. `python manage.py assets` runs
+build_css(), which:
+
+1. Renders every route in every language through the real app and collects
+   the classes, ids and tags the components actually emit (plus class
+   names referenced from Alpine bindings and from Python sources, for
+   states that no GET renders, like `.visible` or `.success-message`).
+2. Writes static/css/site.min.css: both stylesheets concatenated,
+   minified, with rules whose selectors can never match removed.
+3. Writes static/css/critical/{page type}.css for each page type
+   ('home', 'post', 'projects', ... from Page(page_type=...)): the subset
+   of site.min.css needed by the navbar and the first content block of
+   the pages of that type (above the fold). When a type's CSS is over
+   CRITICAL_BUDGET, fewer elements count as above the fold until it fits.
+
+Rules for the markup the content pipeline generates (CONTENT_CLASSES:
+Pygments `.highlight` tokens, the TOC) are never pruned, from site.min.css
+nor from the critical CSS of page types that show content, and neither
+are `.prose` rules (any markdown element) from site.min.css: which tokens
+and tags a post uses changes with every edit, without a rebuild.
+
+Page() inlines the critical CSS of its type in <head> (it cannot be
+cached, so it is kept within the first round trip) and loads
+site.min.css without blocking render; page types without critical CSS
+link site.min.css. Without the build artefacts it links the source
+stylesheets as before.
+
+Settings (.env):
+    CRITICAL_CSS=false   # Always link the source stylesheets
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSS_DIR = BASE_DIR / 'static' / 'css'
+
+# Source stylesheets, in cascade order
+SOURCE_STYLESHEETS = ['main.css', 'theme-geometric.css']
+FULL_STYLESHEET = 'site.min.css'
+CRITICAL_DIR = CSS_DIR / 'critical'
+
+CRITICAL_ENABLED = os.getenv('CRITICAL_CSS', 'true').lower() != 'false'
+
+# Elements of the first content block that count as above the fold
+ABOVE_THE_FOLD_ELEMENTS = 80
+# Largest critical CSS inlined per page (about one initial TCP congestion window)
+CRITICAL_BUDGET = 14 * 1024
+
+# Classes of the content pipeline's markup: rules using them are always kept
+CONTENT_CLASSES = {'highlight', 'post-toc', 'has-toc', 'toc-list', 'toc-title'}
+# Wrapper of rendered markdown: its rules are kept in site.min.css
+MARKDOWN_CLASSES = {'prose'}
+
+# Python sources scanned for class names toggled at runtime
+CLASS_SOURCES = ['main.py', 'components', 'pages']
+
+# At-rules whose blocks contain rules (pruned recursively)
+NESTED_AT_RULES = ('@media', '@supports')
+
+# (prelude, body): body is a declaration string, a list of nested rules,
+# or None for statements such as @import
+Rule = Tuple[str, Union[str, List['Rule'], None]]
+
+_STRING_OR_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.S)
+_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_ID_RE = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+_TAG_RE = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][\w-]*)')
+_ATTRIBUTE_RE = re.compile(r'\[([\w-]+)(?:([~|^$*]?=)["\']?([^"\'\]]*)["\']?)?\]')
+_IGNORED_SELECTOR_PARTS_RE = re.compile(r'\[[^\]]*\]|:not\([^)]*\)|::?[\w-]+(?:\([^)]*\))?')
+_WORD_RE = re.compile(r'[_a-zA-Z][\w-]*')
+_PAGE_TYPE_RE = re.compile(r'<body[^>]*\sdata-page="([\w-]+)"')
+
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+# ---------------------------------------------------------------------------
+# Parsing and minification
+# ---------------------------------------------------------------------------
+
+def minify(css: str) -> str:
+    """Strip comments and redundant whitespace, leaving strings untouched."""
+    css = _STRING_OR_COMMENT_RE.sub(lambda m: '' if m[0].startswith('/*') else m[0], css)
+    out = []
+    for i, part in enumerate(_STRING_OR_COMMENT_RE.split(css)):
+        if i % 2:
+            out.append(part)
+            continue
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        part = re.sub(r':\s+', ':', part)
+        out.append(part)
+    return ''.join(out).replace(';}', '}').strip()
+
+
+def _skip_string(css: str, i: int) -> int:
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def _block_end(css: str, start: int) -> int:
+    """Index just past the '}' matching the '{' at start."""
+    depth, i = 0, start
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError('Unbalanced braces in stylesheet')
+
+
+def parse(css: str) -> List[Rule]:
+    """Split minified CSS into top-level rules (nested for @media/@supports)."""
+    rules: List[Rule] = []
+    i = 0
+    while i < len(css):
+        j = i
+        while j < len(css) and css[j] not in '{;':
+            j = _skip_string(css, j) if css[j] in '"\'' else j + 1
+        prelude = css[i:j].strip()
+        if j >= len(css):
+            break
+        if css[j] == ';':
+            if prelude:
+                rules.append((prelude, None))
+            i = j + 1
+            continue
+        end = _block_end(css, j)
+        body = css[j + 1:end - 1]
+        if prelude.startswith(NESTED_AT_RULES):
+            rules.append((prelude, parse(body)))
+        else:
+            rules.append((prelude, body))
+        i = end
+    return rules
+
+
+def serialize(rules: Iterable[Rule]) -> str:
+    out = []
+    for prelude, body in rules:
+        if body is None:
+            out.append(f'{prelude};')
+        elif isinstance(body, list):
+            if body:
+                out.append(f'{prelude}{{{serialize(body)}}}')
+        else:
+            out.append(f'{prelude}{{{body}}}')
+    return ''.join(out)
+
+
+# ---------------------------------------------------------------------------
+# Selector usage
+# ---------------------------------------------------------------------------
+
+class Usage:
+    """Classes, ids, tags and attributes seen in rendered pages."""
+
+    def __init__(self):
+        self.classes: Set[str] = set()
+        self.ids: Set[str] = set()
+        self.tags: Set[str] = {'html', 'body'}
+        self.attributes: Set[Tuple[str, str]] = set()
+
+    def update(self, other: 'Usage') -> None:
+        self.classes |= other.classes
+        self.ids |= other.ids
+        self.tags |= other.tags
+        self.attributes |= other.attributes
+
+    def _attribute_matches(self, name: str, op: str, value: str) -> bool:
+        if op == '=':
+            return (name, value) in self.attributes
+        # Presence or partial-value match: only check the attribute is used
+        return any(attr == name for attr, _ in self.attributes)
+
+    def selector_matches(self, selector: str) -> bool:
+        """Whether a single (non-list) selector may match something we emit."""
+        if not all(self._attribute_matches(*match) for match in _ATTRIBUTE_RE.findall(selector)):
+            return False
+        selector = _IGNORED_SELECTOR_PARTS_RE.sub('', selector)
+        return (all(name in self.classes for name in _CLASS_RE.findall(selector))
+                and all(name in self.ids for name in _ID_RE.findall(selector))
+                and all(tag.lower() in self.tags for tag in _TAG_RE.findall(_CLASS_RE.sub('', _ID_RE.sub('', selector)))))
+
+    def rule_matches(self, prelude: str) -> bool:
+        return any(self.selector_matches(selector) for selector in prelude.split(','))
+
+
+class _UsageParser(HTMLParser):
+    """Collects usage for a whole page and for its above-the-fold part."""
+
+    def __init__(self, fold_elements: int = ABOVE_THE_FOLD_ELEMENTS):
+        super().__init__(convert_charrefs=True)
+        self.fold_elements = fold_elements
+        self.page = Usage()
+        self.above_fold = Usage()
+        self._depth = 0
+        self._body_depth: Optional[int] = None
+        self._top_level_seen = 0
+        self._fold_elements = 0
+
+    def _in_fold(self) -> bool:
+        return self._body_depth is None or (self._top_level_seen <= 2 and self._fold_elements < self.fold_elements)
+
+    def handle_starttag(self, tag, attrs):
+        if self._body_depth is not None and self._depth == self._body_depth + 1:
+            # nav, then the first content block (hero, page header, ...)
+            self._top_level_seen += 1
+        in_fold = self._in_fold()
+        if self._body_depth is not None and in_fold:
+            self._fold_elements += 1
+
+        for usage in (self.page, self.above_fold) if in_fold else (self.page,):
+            usage.tags.add(tag)
+            for name, value in attrs:
+                usage.attributes.add((name, value or ''))
+                if not value:
+                    continue
+                if name == 'class':
+                    usage.classes.update(value.split())
+                elif name == 'id':
+                    usage.ids.add(value)
+                elif name.startswith((':', 'x-bind:class')):
+                    # Alpine class bindings: "{ 'visible': show }"
+                    usage.classes.update(_WORD_RE.findall(value))
+
+        if tag == 'body':
+            self._body_depth = self._depth
+        if tag not in _VOID_TAGS:
+            self._depth += 1
+
+    def handle_endtag(self, tag):
+        if tag not in _VOID_TAGS:
+            self._depth -= 1
+
+
+def page_usage(html: str, fold_elements: int = ABOVE_THE_FOLD_ELEMENTS) -> Tuple[Usage, Usage]:
+    """(whole page, above the fold) usage of a rendered page."""
+    parser = _UsageParser(fold_elements)
+    parser.feed(html)
+    return parser.page, parser.above_fold
+
+
+def page_type(html: str) -> str:
+    """Page type a rendered page was built with (Page(page_type=...))."""
+    match = _PAGE_TYPE_RE.search(html)
+    return match[1] if match else 'page'
+
+
+def source_class_names(paths: Iterable[Path]) -> Set[str]:
+    """Words in string literals of Python sources (runtime-only classes)."""
+    names = set()
+    for root in paths:
+        for path in ([root] if root.is_file() else sorted(root.rglob('*.py'))):
+            for literal in re.findall(r'[\'"]([^\'"\n]*)[\'"]', path.read_text(encoding='utf-8')):
+                names.update(_WORD_RE.findall(literal))
+    return names
+
+
+# ---------------------------------------------------------------------------
+# Pruning
+# ---------------------------------------------------------------------------
+
+def prune(rules: List[Rule], usage: Usage, keep_unscoped: bool = True,
+          keep_classes: Set[str] = CONTENT_CLASSES | MARKDOWN_CLASSES) -> List[Rule]:
+    """
+    Drop style rules whose selectors cannot match.
+
+    Args:
+        rules: Parsed stylesheet.
+        usage: Classes/ids/tags to keep.
+        keep_unscoped: Keep @font-face, @import, @keyframes (keyframes are
+            filtered afterwards by prune_keyframes).
+        keep_classes: Keep every rule using one of these classes, used or not.
+    """
+    kept: List[Rule] = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            nested = prune(body, usage, keep_unscoped, keep_classes)
+            if nested:
+                kept.append((prelude, nested))
+        elif prelude.startswith('@'):
+            if keep_unscoped or prelude.startswith('@font-face'):
+                kept.append((prelude, body))
+        elif not keep_classes.isdisjoint(_CLASS_RE.findall(prelude)) or usage.rule_matches(prelude):
+            kept.append((prelude, body))
+    return kept
+
+
+def prune_keyframes(rules: List[Rule]) -> List[Rule]:
+    """Drop @keyframes that no remaining declaration refers to."""
+    declarations = serialize(rule for rule in rules if not rule[0].startswith('@keyframes'))
+    used = set(_WORD_RE.findall(declarations))
+    return [rule for rule in rules
+            if not rule[0].startswith('@keyframes') or rule[0].split(maxsplit=1)[-1] in used]
+
+
+def _hoist_imports(rules: List[Rule]) -> List[Rule]:
+    """@import is only valid before other rules once the sheets are concatenated."""
+    return [r for r in rules if r[0].startswith('@import')] + [r for r in rules if not r[0].startswith('@import')]
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def collect_usage(langs: Optional[Iterable[str]] = None) -> Tuple[Usage, Dict[str, List[str]]]:
+    """Render every route and return (all pages usage, rendered pages by page type)."""
+    from starlette.testclient import TestClient
+    from services.export import NOT_FOUND_PROBE, site_routes
+    from services.i18n import SUPPORTED_LANGUAGES
+    import main
+
+    full = Usage()
+    pages: Dict[str, List[str]] = {}
+    for lang in langs or SUPPORTED_LANGUAGES:
+        client = TestClient(main.app, cookies={'lang': lang})
+        for route in site_routes(lang) + ['/search', NOT_FOUND_PROBE]:
+            html = client.get(route).text
+            full.update(page_usage(html)[0])
+            pages.setdefault(page_type(html), []).append(html)
+
+    full.classes |= source_class_names(BASE_DIR / path for path in CLASS_SOURCES)
+    return full, pages
+
+
+def critical_stylesheet(rules: List[Rule], pages: List[str], budget: int = CRITICAL_BUDGET) -> str:
+    """Above-the-fold CSS of a set of pages, shrinking the fold until it fits the budget."""
+    keyframes = [rule for rule in rules if rule[0].startswith('@keyframes')]
+    # Content may start above the fold on any page that has it
+    has_content = any(not CONTENT_CLASSES.isdisjoint(page_usage(html)[0].classes) for html in pages)
+    keep_classes = CONTENT_CLASSES if has_content else set()
+    fold_elements = ABOVE_THE_FOLD_ELEMENTS
+    while True:
+        usage = Usage()
+        for html in pages:
+            usage.update(page_usage(html, fold_elements)[1])
+        css = serialize(prune_keyframes(prune(rules, usage, keep_unscoped=False, keep_classes=keep_classes) + keyframes))
+        if len(css.encode('utf-8')) <= budget or fold_elements <= 1:
+            return css
+        fold_elements //= 2
+
+
+def build_css(css_dir: Path = CSS_DIR, langs: Optional[Iterable[str]] = None) -> Tuple[int, Dict[str, int]]:
+    """
+    Write site.min.css and the critical CSS of every page type.
+
+    Returns:
+        Size in bytes of site.min.css, and of the critical CSS per page type.
+    """
+    os.environ.setdefault('CONTENT_WATCH', 'false')
+    os.environ.setdefault('OUTBOX_WORKER', 'false')
+
+    source = '\n'.join((css_dir / name).read_text(encoding='utf-8') for name in SOURCE_STYLESHEETS)
+    rules = _hoist_imports(parse(minify(source)))
+    full_usage, pages = collect_usage(langs)
+
+    full = serialize(prune_keyframes(prune(rules, full_usage)))
+    (css_dir / FULL_STYLESHEET).write_text(full, encoding='utf-8')
+
+    critical_dir = css_dir / CRITICAL_DIR.name
+    critical_dir.mkdir(exist_ok=True)
+    for stale in critical_dir.glob('*.css'):
+        stale.unlink()
+    sizes = {}
+    for kind, htmls in sorted(pages.items()):
+        css = critical_stylesheet(rules, htmls)
+        (critical_dir / f'{kind}.css').write_text(css, encoding='utf-8')
+        sizes[kind] = len(css.encode('utf-8'))
+
+    print(f"[critical_css] {len(source) / 1024:.0f} KB source -> {len(full) / 1024:.0f} KB {FULL_STYLESHEET}, critical: "
+          + ', '.join(f'{kind} {size / 1024:.1f} KB' for kind, size in sizes.items()))
+    return len(full), sizes
+
+
+# ---------------------------------------------------------------------------
+# Runtime
+# ---------------------------------------------------------------------------
+
+# page type -> (mtime, css)
+_critical_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def stylesheet_built() -> bool:
+    """Whether site.min.css has been built (and is enabled)."""
+    return CRITICAL_ENABLED and (CSS_DIR / FULL_STYLESHEET).is_file()
+
+
+def critical_css(page_type: str) -> Optional[str]:
+    """Built critical CSS of a page type (re-read when the file changes), or None if not built."""
+    if not stylesheet_built():
+        return None
+    path = CRITICAL_DIR / f'{page_type}.css'
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _critical_cache.get(page_type)
+    if cached is None or cached[0] != mtime:
+        cached = _critical_cache[page_type] = (mtime, path.read_text(encoding='utf-8'))
+    return cached[1]
@@ -6,6 +6,10 @@ Setup:
 2. Get API key from dashboard
 3. Add to .env: RESEND_API_KEY=re_xxxxx
 4. Verify your domain or use onboarding@resend.dev for testing
+
+Messages are not sent from request handlers: POST /contact queues them in
+services/outbox.py, whose delivery thread calls send_contact_email.
+RESEND_API_URL points the client at another server (e.g. a local stand-in).
 """
 
 import os
@@ -35,6 +39,7 @@ def send_contact_email(msg: ContactMessage) -> tuple[bool, Optional[str]]:
         return False, "RESEND_API_KEY not configured"
 
     resend.api_key = api_key
+    resend.api_url = os.getenv('RESEND_API_URL', 'https://api.resend.com')
 
     # Use Resend's test address if no verified domain
     from_email = os.getenv('RESEND_FROM_EMAIL', 'onboarding@resend.dev')
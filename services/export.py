@@ -0,0 +1,152 @@
+"""
+Static site export.
+
+Renders every GET route for every supported language to plain HTML files,
+plus a copy of static/, so a static server (or Traefik in front of one)
+can serve the site directly and Python only has to handle POST /contact.
+
+Output layout (one tree per language, default language at the root too):
+
+dist/
+├── index.html, blog/..., projects/...     # DEFAULT_LANGUAGE
+├── es/
+│   ├── index.html
+│   ├── 404.html
+│   ├── feed.xml, sitemap.xml
+│   ├── blog/index.html
+│   ├── blog/{slug}/index.html
+│   ├── projects/index.html
+│   └── projects/{slug}/index.html
+├── en/...
+└── static/...
+
+Pages and assets get precompressed .br/.gz siblings, and every asset also
+gets a content-hashed copy matching the URLs in the pages (services/assets.py).
+
+Pages are rendered through the real ASGI app (middleware included), so
+the output is byte-for-byte what the dynamic server would return.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = BASE_DIR / 'dist'
+
+# Path used to render each language's 404 page
+NOT_FOUND_PROBE = '/blog/__not-found__'
+
+# Per-process ASGI clients, one per language (see _init_worker)
+_clients: Dict[str, object] = {}
+
+
+def site_routes(lang: str) -> List[str]:
+    """All GET routes that render a page for a language."""
+    from services.feeds import page_lastmods
+    return list(page_lastmods(lang))
+
+
+def output_path(out_dir: Path, lang: str, route: str) -> Path:
+    """File that serves a route: /blog/x -> {lang}/blog/x/index.html."""
+    if route == NOT_FOUND_PROBE:
+        return out_dir / lang / '404.html'
+    return out_dir / lang / route.strip('/') / 'index.html'
+
+
+def _init_worker() -> None:
+    """Import the app once per export process, without background work."""
+    from data import blog_loader, compiler
+    os.environ['CONTENT_WATCH'] = 'false'
+    os.environ['OUTBOX_WORKER'] = 'false'
+    compiler.PARALLEL_ENABLED = False
+    # ?page= / ?after= URLs cannot be served statically: list every post
+    blog_loader.POSTS_PER_PAGE = 0
+
+
+def _client(lang: str):
+    client = _clients.get(lang)
+    if client is None:
+        from starlette.testclient import TestClient
+        import main
+        client = _clients[lang] = TestClient(main.app, cookies={'lang': lang})
+    return client
+
+
+def _render(lang: str, route: str, out_dir: str) -> Tuple[str, int]:
+    """Render one route to its output file (runs inside a pool worker)."""
+    response = _client(lang).get(route)
+    if response.status_code not in (200, 404):
+        raise RuntimeError(f'{route} ({lang}) returned {response.status_code}')
+
+    target = output_path(Path(out_dir), lang, route)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(response.content)
+    return str(target), len(response.content)
+
+
+def export_site(out_dir: Path = DEFAULT_OUTPUT_DIR, langs: Optional[Iterable[str]] = None,
+                workers: Optional[int] = None) -> int:
+    """
+    Export every page for every language to out_dir.
+
+    Args:
+        out_dir: Output directory (replaced if it exists).
+        langs: Languages to export (defaults to SUPPORTED_LANGUAGES).
+        workers: Render processes (defaults to available cores).
+
+    Returns:
+        Number of HTML files written.
+    """
+    from data.compiler import available_workers, preload_content
+    from services.i18n import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES
+
+    langs = list(langs or SUPPORTED_LANGUAGES)
+    out_dir = Path(out_dir)
+
+    # Compile every body once, in parallel, before the render processes start
+    preload_content(langs, bodies=True)
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+
+    jobs = [(lang, route) for lang in langs for route in site_routes(lang) + [NOT_FOUND_PROBE]]
+    workers = max(1, min(workers or available_workers(), len(jobs)))
+    print(f"[export] Rendering {len(jobs)} pages on {workers} processes")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = list(pool.map(
+            _render,
+            [lang for lang, _ in jobs],
+            [route for _, route in jobs],
+            [str(out_dir)] * len(jobs),
+            chunksize=max(1, len(jobs) // (workers * 4)),
+        ))
+
+    # Atom feed of each language, and the sitemap next to it (the tree is picked per language)
+    from services.feeds import get_feed, get_sitemap
+    sitemap = get_sitemap().body
+    for lang in langs:
+        (out_dir / lang / 'feed.xml').write_bytes(get_feed(lang).body)
+        (out_dir / lang / 'sitemap.xml').write_bytes(sitemap)
+
+    # Default language is also served from the root
+    if DEFAULT_LANGUAGE in langs:
+        shutil.copytree(out_dir / DEFAULT_LANGUAGE, out_dir, dirs_exist_ok=True)
+
+    shutil.copytree(BASE_DIR / 'static', out_dir / 'static')
+
+    # Pages link to fingerprinted URLs: write a hashed copy of every asset
+    from services.assets import build_manifest, precompress
+    for name, hashed in build_manifest(out_dir / 'static').items():
+        shutil.copy2(out_dir / 'static' / name, out_dir / 'static' / hashed)
+
+    # .br/.gz siblings for pages and assets (nginx gzip_static / brotli_static)
+    precompress(out_dir)
+
+    total = sum(size for _, size in results)
+    print(f"[export] Wrote {len(results)} pages ({total / 1024:.0f} KB) to {out_dir}")
+    return len(results)
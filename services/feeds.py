@@ -0,0 +1,209 @@
+"""
+Atom feeds and sitemap.xml.
+
+/feed.xml is an Atom feed of the blog in the current language
+(/feed.xml?lang=en for a given one) and /sitemap.xml lists every page in
+every language, with hreflang alternates and lastmod taken from the
+source files' mtimes.
+
+Both documents are built from the loader indexes once per content
+version and kept as bytes together with their ETag (body hash) and
+Last-Modified (newest source file), so feed readers and crawlers polling
+them get a bodiless 304 instead of a render.
+
+Links are absolute URLs on SITE_URL, never on the request's Host header,
+so a client cannot make the cached documents point to another host.
+
+Settings (.env):
+    SITE_URL=https://example.com   # Base of absolute links (default: the production domain)
+"""
+
+import os
+import hashlib
+import threading
+import email.utils
+import xml.etree.ElementTree as etree
+from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from starlette.responses import Response
+
+import data.content as site_content
+from data.content import site_config
+from data.content_store import content_version, subscribe
+from services.assets import REVALIDATE_CACHE_CONTROL, not_modified
+from services.i18n import DEFAULT_LANGUAGE, LOCALES_PATH, SUPPORTED_LANGUAGES
+
+SITE_URL = os.getenv('SITE_URL', 'https://esteban-ams.cl').rstrip('/')
+
+# Newest posts included in a feed
+FEED_ENTRIES = 20
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XHTML_NS = 'http://www.w3.org/1999/xhtml'
+etree.register_namespace('xhtml', XHTML_NS)
+
+
+@dataclass
+class Document:
+    body: bytes
+    etag: str
+    last_modified: str
+    media_type: str
+
+
+# name -> (content version, document)
+_documents: Dict[str, Tuple[int, Document]] = {}
+_lock = threading.Lock()
+
+
+def _mtime(path) -> float:
+    try:
+        return Path(path).stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _w3c(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+def _newest(items: Iterable[Dict]) -> float:
+    return max((_mtime(item['filepath']) for item in items), default=0.0)
+
+
+def page_lastmods(lang: str) -> Dict[str, float]:
+    """Every page route of a language -> mtime of the newest file it shows (in listing order)."""
+    from data.blog_loader import get_post_index
+    from data.project_loader import get_project_index
+
+    posts, projects = get_post_index(lang), get_project_index(lang)
+    site_files = max(_mtime(site_content.__file__), _mtime(LOCALES_PATH / f'{lang}.yml'))
+    newest_post, newest_project = _newest(posts.items), _newest(projects.items)
+
+    pages = {
+        '/': max(site_files, newest_post, newest_project),
+        '/blog': newest_post,
+        '/projects': newest_project,
+    }
+    pages.update({f"/blog/{post['slug']}": _mtime(post['filepath']) for post in posts.items})
+    pages.update({f"/projects/{project['slug']}": _mtime(project['filepath']) for project in projects.items})
+    for prefix, index, facet in (('/blog/tag', posts, 'tag'), ('/blog/category', posts, 'category'),
+                                 ('/projects/tech', projects, 'tech')):
+        for key, _, _ in index.facet_values(facet):
+            pages[f'{prefix}/{key}'] = _newest(index.facets[facet][key])
+    return pages
+
+
+def _document(root: etree.Element, newest: float, media_type: str) -> Document:
+    body = etree.tostring(root, encoding='utf-8', xml_declaration=True)
+    return Document(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+        last_modified=email.utils.formatdate(newest, usegmt=True),
+        media_type=media_type,
+    )
+
+
+def build_feed(lang: str, base_url: str) -> Document:
+    """Atom feed of the newest posts of a language."""
+    from data.blog_loader import get_all_posts
+
+    posts = get_all_posts(lang)[:FEED_ENTRIES]
+    updated = _newest(posts)
+
+    def el(parent, tag, text=None, **attrs):
+        node = etree.SubElement(parent, tag, attrs)
+        node.text = text
+        return node
+
+    # Unprefixed tags in the default namespace declared on the root
+    feed = etree.Element('feed', {'xmlns': ATOM_NS, '{http://www.w3.org/XML/1998/namespace}lang': lang})
+    el(feed, 'id', f'{base_url}/blog?lang={lang}')
+    el(feed, 'title', f"Blog | {site_config['name']}")
+    el(feed, 'subtitle', site_config['description'])
+    el(feed, 'updated', _w3c(updated))
+    el(feed, 'link', rel='self', href=f'{base_url}/feed.xml?lang={lang}')
+    el(feed, 'link', rel='alternate', type='text/html', href=f'{base_url}/blog?lang={lang}')
+    el(el(feed, 'author'), 'name', site_config['name'])
+
+    for post in posts:
+        url = f"{base_url}/blog/{post['slug']}?lang={lang}"
+        entry = el(feed, 'entry')
+        el(entry, 'id', url)
+        el(entry, 'title', post['title'])
+        el(entry, 'link', rel='alternate', type='text/html', href=url)
+        if post['date']:
+            el(entry, 'published', f"{post['date']}T00:00:00Z")
+        el(entry, 'updated', _w3c(_mtime(post['filepath'])))
+        for tag in post.get('tags', []):
+            el(entry, 'category', term=str(tag))
+        if post['excerpt']:
+            el(entry, 'summary', post['excerpt'])
+        el(entry, 'content', post['html'], type='html')
+
+    return _document(feed, updated, 'application/atom+xml; charset=utf-8')
+
+
+def build_sitemap(base_url: str) -> Document:
+    """Sitemap of every page in every language, with hreflang alternates."""
+    lastmods = {lang: page_lastmods(lang) for lang in SUPPORTED_LANGUAGES}
+    routes = list(dict.fromkeys(route for pages in lastmods.values() for route in pages))
+
+    urlset = etree.Element('urlset', {'xmlns': SITEMAP_NS})
+    for route in routes:
+        langs = [lang for lang in SUPPORTED_LANGUAGES if route in lastmods[lang]]
+        for lang in langs:
+            url = etree.SubElement(urlset, 'url')
+            etree.SubElement(url, 'loc').text = f'{base_url}{route}?lang={lang}'
+            etree.SubElement(url, 'lastmod').text = _w3c(lastmods[lang][route])
+            for alternate in langs:
+                etree.SubElement(url, f'{{{XHTML_NS}}}link', rel='alternate', hreflang=alternate,
+                                 href=f'{base_url}{route}?lang={alternate}')
+            if DEFAULT_LANGUAGE in langs:
+                # Without ?lang the language comes from the cookie / Accept-Language
+                etree.SubElement(url, f'{{{XHTML_NS}}}link', rel='alternate', hreflang='x-default',
+                                 href=f'{base_url}{route}')
+
+    newest = max((mtime for pages in lastmods.values() for mtime in pages.values()), default=0.0)
+    return _document(urlset, newest, 'application/xml; charset=utf-8')
+
+
+def _cached(name: str, build) -> Document:
+    version = content_version()
+    entry = _documents.get(name)
+    if entry is None or entry[0] != version:
+        with _lock:
+            entry = _documents.get(name)
+            if entry is None or entry[0] != version:
+                entry = _documents[name] = (version, build())
+    return entry[1]
+
+
+def get_feed(lang: str) -> Document:
+    """Atom feed of a language (rebuilt after content changes)."""
+    return _cached(f'feed:{lang}', lambda: build_feed(lang, SITE_URL))
+
+
+def get_sitemap() -> Document:
+    """sitemap.xml (rebuilt after content changes)."""
+    return _cached('sitemap', lambda: build_sitemap(SITE_URL))
+
+
+# Drop documents of older content versions instead of keeping them until the next request
+subscribe(lambda kind, lang: _documents.clear())
+
+
+def document_response(document: Document, request_headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Serve a cached document, or a 304 if the client's copy is current."""
+    headers = {
+        'ETag': document.etag,
+        'Last-Modified': document.last_modified,
+        'Cache-Control': REVALIDATE_CACHE_CONTROL,
+    }
+    if not_modified(document.etag, document.last_modified, request_headers or {}):
+        return Response(status_code=304, headers=headers)
+    return Response(document.body, media_type=document.media_type, headers=headers)
@@ -0,0 +1,79 @@
+"""
+Per-language memoised HTML fragments.
+
+Components that only depend on data/content.py and the current language
+(Hero, Experience, Skills, About, Contact, Footer, Navbar) are rendered
+once per language and reused as pre-serialised NotStr, instead of
+rebuilding and serialising their FT tree on every request:
+
+    @fragment
+    def Hero(): ...
+
+    @fragment(key=lambda: datetime.date.today().year)
+    def Footer(): ...
+
+The optional key adds anything else the output depends on. Fragments are
+keyed on the content version, which changes on content or locale reloads
+and on edits to data/content.py (data/watcher.py); old entries are dropped
+at the same time.
+
+Settings (.env):
+    FRAGMENT_CACHE=false   # Render components on every request
+"""
+
+import os
+import threading
+from functools import wraps
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from fasthtml.common import NotStr, to_xml
+
+from data.content_store import content_version, subscribe
+from services.i18n import get_language
+
+CACHE_ENABLED = os.getenv('FRAGMENT_CACHE', 'true').lower() != 'false'
+
+_fragments: Dict[Tuple[str, str, int, Hashable], NotStr] = {}
+_lock = threading.Lock()
+
+
+def fragment(fn: Optional[Callable] = None, *, key: Optional[Callable[[], Hashable]] = None):
+    """
+    Memoise a zero-argument component per language as a serialised NotStr.
+
+    Args:
+        fn: Component function (when used as a bare decorator).
+        key: Extra cache-key function for other inputs (e.g. the year).
+    """
+    def decorator(component: Callable) -> Callable:
+        name = f'{component.__module__}.{component.__qualname__}'
+
+        @wraps(component)
+        def wrapper():
+            if not CACHE_ENABLED:
+                return component()
+            version = content_version()
+            cache_key = (name, get_language(), version, key() if key else None)
+            html = _fragments.get(cache_key)
+            if html is None:
+                html = NotStr(to_xml(component()))
+                with _lock:
+                    # Content reloaded while rendering: html may mix old and new data
+                    if content_version() == version:
+                        _fragments[cache_key] = html
+            return html
+
+        wrapper.uncached = component
+        return wrapper
+
+    return decorator(fn) if fn is not None else decorator
+
+
+def clear_fragments() -> None:
+    """Drop every cached fragment."""
+    with _lock:
+        _fragments.clear()
+
+
+# Entries for older content versions can no longer be hit
+subscribe(lambda kind, lang: clear_fragments())
@@ -2,12 +2,23 @@
 Internationalization (i18n) service.
 
 Simple custom implementation for translation handling.
+
+Locale files are compiled once into flat per-language tables
+({'nav.home': 'Inicio', ...}, with the default language already merged
+in for missing keys), so t() is a single dict lookup. The compiled tables
+are also pickled under CONTENT_CACHE_DIR and reused while the YAML files
+are unchanged, skipping the YAML parse on startup.
 """
 
+import os
+import pickle
 import yaml
 from pathlib import Path
 from contextvars import ContextVar
-from functools import reduce
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from data.content_cache import CACHE_DIR, CACHE_ENABLED
 
 # Context variable to store current language per request
 current_language: ContextVar[str] = ContextVar('current_language', default='es')
@@ -19,23 +30,92 @@ DEFAULT_LANGUAGE = 'es'
 # Locales path
 LOCALES_PATH = Path(__file__).resolve().parent.parent / 'locales'
 
-# Cache for loaded translations
-_translations_cache: dict = {}
+# Compiled tables artefact
+COMPILED_PATH = CACHE_DIR / 'locales.pickle'
+
+# Compiled flat tables per language
+_tables: Dict[str, Dict[str, Any]] = {}
+
+# Table bound to the current request by set_language()
+current_table: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_table', default=None)
 
 
 def _load_translations(lang: str) -> dict:
     """Load translations for a language from YAML file."""
-    if lang in _translations_cache:
-        return _translations_cache[lang]
-
     file_path = LOCALES_PATH / f'{lang}.yml'
     if file_path.exists():
         with open(file_path, 'r', encoding='utf-8') as f:
-            _translations_cache[lang] = yaml.safe_load(f) or {}
-    else:
-        _translations_cache[lang] = {}
-
-    return _translations_cache[lang]
+            return yaml.safe_load(f) or {}
+    return {}
+
+
+def _flatten(tree: dict, prefix: str = '', table: Optional[dict] = None) -> Dict[str, Any]:
+    """{'nav': {'home': 'Inicio'}} -> {'nav': {...}, 'nav.home': 'Inicio'}."""
+    table = {} if table is None else table
+    for key, value in tree.items():
+        path = f'{prefix}{key}'
+        table[path] = value
+        if isinstance(value, dict):
+            _flatten(value, f'{path}.', table)
+    return table
+
+
+def _source_stamp() -> tuple:
+    """mtime/size of every locale file (validates the compiled artefact)."""
+    stamp = []
+    for lang in SUPPORTED_LANGUAGES:
+        try:
+            stat = (LOCALES_PATH / f'{lang}.yml').stat()
+            stamp.append((lang, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append((lang, None, None))
+    return tuple(stamp)
+
+
+def compile_translations() -> Dict[str, Dict[str, Any]]:
+    """Build flat tables for every language, with the default language merged in."""
+    default = _flatten(_load_translations(DEFAULT_LANGUAGE))
+    return {
+        lang: default if lang == DEFAULT_LANGUAGE else {**default, **_flatten(_load_translations(lang))}
+        for lang in SUPPORTED_LANGUAGES
+    }
+
+
+def _load_tables() -> Dict[str, Dict[str, Any]]:
+    """Compiled tables from the pickle artefact when fresh, else from YAML."""
+    stamp = _source_stamp()
+    if CACHE_ENABLED:
+        try:
+            with open(COMPILED_PATH, 'rb') as f:
+                cached_stamp, tables = pickle.load(f)
+            if cached_stamp == stamp:
+                return tables
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+
+    tables = compile_translations()
+    if CACHE_ENABLED:
+        try:
+            COMPILED_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = COMPILED_PATH.with_name(f'{COMPILED_PATH.name}.{os.getpid()}')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((stamp, tables), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, COMPILED_PATH)
+        except OSError as e:
+            print(f"[i18n] Could not write compiled locales: {e}")
+    return tables
+
+
+def translations(lang: str) -> Dict[str, Any]:
+    """Flat translation table for a language (compiled on first use)."""
+    if not _tables:
+        _tables.update(_load_tables())
+    return _tables.get(lang) or _tables[DEFAULT_LANGUAGE]
+
+
+def reload_translations() -> None:
+    """Drop compiled translations so the YAML files are read again."""
+    _tables.clear()
 
 
 def get_language() -> str:
@@ -44,9 +124,10 @@ def get_language() -> str:
 
 
 def set_language(lang: str) -> None:
-    """Set current language in context."""
+    """Set current language in context (and bind its translation table)."""
     if lang in SUPPORTED_LANGUAGES:
         current_language.set(lang)
+        current_table.set(translations(lang))
 
 
 def t(key: str, **kwargs) -> str:
@@ -57,65 +138,69 @@ def t(key: str, **kwargs) -> str:
         t('nav.home')  # Returns "Inicio" or "Home"
         t('hero.greeting')  # Returns "Hola, soy" or "Hi, I'm"
     """
-    lang = get_language()
-    translations = _load_translations(lang)
-
-    # Navigate nested dict using dot notation
-    try:
-        value = reduce(lambda d, k: d[k], key.split('.'), translations)
-        # Handle string interpolation if kwargs provided
+    table = current_table.get()
+    if table is None or not _tables:
+        table = translations(get_language())
+    value = table.get(key, key)
+    # Handle string interpolation if kwargs provided
+    if kwargs and isinstance(value, str):
+        return value.format(**kwargs)
+    return value
+
+
+def translator(lang: str) -> Callable[..., str]:
+    """t() bound to a language, for rendering outside the request's language."""
+    table = translations(lang)
+
+    def translate(key: str, **kwargs) -> str:
+        value = table.get(key, key)
         if kwargs and isinstance(value, str):
             return value.format(**kwargs)
         return value
-    except (KeyError, TypeError):
-        # Fallback to default language
-        if lang != DEFAULT_LANGUAGE:
-            fallback_translations = _load_translations(DEFAULT_LANGUAGE)
-            try:
-                value = reduce(lambda d, k: d[k], key.split('.'), fallback_translations)
-                if kwargs and isinstance(value, str):
-                    return value.format(**kwargs)
-                return value
-            except (KeyError, TypeError):
-                pass
-        # Return key if translation not found
-        return key
+
+    return translate
 
 
+@lru_cache(maxsize=256)
 def detect_language_from_header(accept_language: str | None) -> str:
     """
     Detect preferred language from Accept-Language header.
 
+    Results are cached per raw header value (browsers send a handful of
+    distinct values). Malformed q-values are ignored and q=0 means the
+    language is not acceptable.
+
     Examples:
         "en-US,en;q=0.9,es;q=0.8" -> "en"
         "es-ES,es;q=0.9" -> "es"
+        "en;q=abc" -> "es" (default)
         None -> "es" (default)
     """
     if not accept_language:
         return DEFAULT_LANGUAGE
 
     # Parse Accept-Language header
-    languages = []
+    best_lang, best_q = DEFAULT_LANGUAGE, 0.0
     for part in accept_language.split(','):
-        part = part.strip()
-        if ';' in part:
-            lang, q = part.split(';')
-            q = float(q.split('=')[1]) if '=' in q else 1.0
-        else:
-            lang = part
-            q = 1.0
-
+        lang, _, params = part.strip().partition(';')
         # Extract base language (e.g., "en-US" -> "en")
-        base_lang = lang.split('-')[0].lower()
-        if base_lang in SUPPORTED_LANGUAGES:
-            languages.append((base_lang, q))
-
-    # Sort by quality and return best match
-    if languages:
-        languages.sort(key=lambda x: x[1], reverse=True)
-        return languages[0][0]
-
-    return DEFAULT_LANGUAGE
+        base_lang = lang.strip().split('-')[0].lower()
+        if base_lang not in SUPPORTED_LANGUAGES:
+            continue
+
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # Highest quality wins, earliest entry on ties
+        if q > best_q:
+            best_lang, best_q = base_lang, q
+
+    return best_lang
 
 
 def get_content_path(base_path: str, lang: str = None) -> Path:
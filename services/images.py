@@ -0,0 +1,153 @@
+"""
+Responsive image build step and manifest.
+
+`python manage.py assets` runs build_images(), which writes resized
+variants of every raster image under static/images/ for each breakpoint
+width (never upscaling) in AVIF, WebP and the source format:
+
+static/images/variants/about-320.avif, about-320.webp, about-320.jpg, ...
+
+and records them in static/images/manifest.json together with the
+intrinsic width/height of the source. Entries are keyed by a hash of the
+source file, so unchanged images are not re-encoded on the next build.
+
+components/images.py turns a manifest entry into a <picture> with
+srcset/sizes and explicit width/height (no layout shift).
+
+Needs the optional Pillow package; without it (or without AVIF support in
+the installed Pillow) the missing formats are skipped and images are
+served as before.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATIC_PATH = BASE_DIR / 'static'
+IMAGES_PATH = STATIC_PATH / 'images'
+VARIANTS_DIR = 'variants'
+MANIFEST_NAME = 'manifest.json'
+
+SOURCE_SUFFIXES = {'.jpg', '.jpeg', '.png'}
+
+# Breakpoint widths in px (the source width is always added as the largest)
+WIDTHS = [320, 640, 960, 1280]
+
+# Output format -> (file suffix, Pillow save options); the source format
+# itself is added as the <img> fallback
+FORMATS: Dict[str, Tuple[str, dict]] = {
+    'avif': ('.avif', {'quality': 50}),
+    'webp': ('.webp', {'quality': 75, 'method': 6}),
+}
+FALLBACK_OPTIONS = {
+    '.jpg': ('JPEG', {'quality': 80, 'optimize': True, 'progressive': True}),
+    '.jpeg': ('JPEG', {'quality': 80, 'optimize': True, 'progressive': True}),
+    '.png': ('PNG', {'optimize': True}),
+}
+
+_manifest_cache: Tuple[Optional[int], Dict[str, dict]] = (None, {})
+
+
+def _available_formats() -> Dict[str, Tuple[str, dict]]:
+    return {fmt: spec for fmt, spec in FORMATS.items() if features.check(fmt)}
+
+
+def _source_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def _variant_widths(width: int) -> List[int]:
+    return sorted({w for w in WIDTHS if w < width} | {width})
+
+
+def _build_image(path: Path, variants_dir: Path, formats: Dict[str, Tuple[str, dict]]) -> dict:
+    """Encode every variant of one source image and return its manifest entry."""
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source)
+        width, height = image.size
+        fallback_format, fallback_options = FALLBACK_OPTIONS[path.suffix.lower()]
+        outputs = {**formats, 'fallback': (path.suffix.lower(), fallback_options)}
+
+        variants: Dict[str, List[Tuple[int, str]]] = {fmt: [] for fmt in outputs}
+        for target_width in _variant_widths(width):
+            resized = image if target_width == width else image.resize(
+                (target_width, round(height * target_width / width)), Image.LANCZOS)
+            if fallback_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+            for fmt, (suffix, options) in outputs.items():
+                target = variants_dir / f'{path.stem}-{target_width}{suffix}'
+                save_format = fallback_format if fmt == 'fallback' else fmt.upper()
+                resized.save(target, save_format, **options)
+                variants[fmt].append((target_width, target.relative_to(STATIC_PATH).as_posix()))
+
+    return {'width': width, 'height': height, 'hash': _source_hash(path), 'variants': variants}
+
+
+def build_images(root: Path = IMAGES_PATH) -> Dict[str, dict]:
+    """
+    Generate resized AVIF/WebP/fallback variants and write the manifest.
+
+    Returns:
+        The manifest: static path ('images/about.jpg') -> entry with
+        width, height, hash and {format: [(width, path), ...]}.
+    """
+    if Image is None:
+        print("[images] Pillow not installed, skipping responsive variants")
+        return {}
+
+    manifest_path = root / MANIFEST_NAME
+    previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    variants_dir = root / VARIANTS_DIR
+    variants_dir.mkdir(exist_ok=True)
+    formats = _available_formats()
+
+    manifest, built = {}, 0
+    for path in sorted(root.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in SOURCE_SUFFIXES:
+            continue
+        name = path.relative_to(STATIC_PATH).as_posix()
+        entry = previous.get(name)
+        if (entry and entry['hash'] == _source_hash(path) and set(entry['variants']) == {*formats, 'fallback'}
+                and all((STATIC_PATH / p).exists() for paths in entry['variants'].values() for _, p in paths)):
+            manifest[name] = entry
+            continue
+        manifest[name] = _build_image(path, variants_dir, formats)
+        built += 1
+
+    # Variants of removed sources
+    expected = {p for entry in manifest.values() for paths in entry['variants'].values() for _, p in paths}
+    for variant in variants_dir.iterdir():
+        if variant.relative_to(STATIC_PATH).as_posix() not in expected:
+            variant.unlink()
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    skipped = [fmt for fmt in FORMATS if fmt not in formats]
+    print(f"[images] {len(manifest)} images ({built} rebuilt), formats: {', '.join(formats) or 'none'}"
+          + (f" (no Pillow support for {', '.join(skipped)})" if skipped else ''))
+    return manifest
+
+
+def load_manifest() -> Dict[str, dict]:
+    """Image manifest (re-read when the file changes), empty if not built."""
+    global _manifest_cache
+    path = IMAGES_PATH / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    if _manifest_cache[0] != mtime:
+        _manifest_cache = (mtime, json.loads(path.read_text()))
+    return _manifest_cache[1]
+
+
+def image_info(src: str) -> Optional[dict]:
+    """Manifest entry for '/static/images/x.jpg' or 'images/x.jpg', if built."""
+    name = src[len('/static/'):] if src.startswith('/static/') else src.lstrip('/')
+    return load_manifest().get(name)
@@ -0,0 +1,266 @@
+"""
+Durable outbox for contact form emails.
+
+POST /contact only inserts the message into a local SQLite database (WAL
+mode) and answers right away. A background delivery thread in each worker
+process claims due messages and sends them through
+services/email.send_contact_email on a small thread pool, so the Resend
+round-trip never runs on the event loop:
+
+- Claiming a message pushes its next_attempt forward by a lease inside an
+  IMMEDIATE transaction, so gunicorn workers sharing the database never
+  pick the same message, and a message held by a worker that died is
+  retried once its lease expires (delivery is at-least-once).
+- Failed sends are retried with exponential backoff plus jitter. After
+  OUTBOX_MAX_ATTEMPTS the message is dead-lettered (status 'dead') with
+  its last error; `python manage.py outbox --retry-dead` queues them again.
+- Messages the spam filter is unsure about are stored as 'quarantined'
+  and never sent until released with `python manage.py outbox --release`.
+
+Setting RESEND_API_URL to a local HTTP server exercises the whole path
+without calling the real API.
+
+Settings (.env):
+    OUTBOX_PATH=/app/var/outbox.sqlite3   # Defaults to <project>/var/outbox.sqlite3
+    OUTBOX_WORKER=false                   # Do not deliver from this process
+    OUTBOX_CONCURRENCY=2                  # Sends in flight per process
+    OUTBOX_MAX_ATTEMPTS=6                 # Attempts before dead-lettering
+    OUTBOX_BACKOFF=30                     # First retry delay in seconds (doubles per attempt)
+    OUTBOX_POLL_INTERVAL=5                # Seconds between checks for due retries
+"""
+
+import os
+import time
+import atexit
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data.database import ProcessConnection
+from services.email import ContactMessage, send_contact_email
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+OUTBOX_PATH = Path(os.getenv('OUTBOX_PATH', BASE_DIR / 'var' / 'outbox.sqlite3'))
+CONCURRENCY = max(1, int(os.getenv('OUTBOX_CONCURRENCY', 2)))
+MAX_ATTEMPTS = max(1, int(os.getenv('OUTBOX_MAX_ATTEMPTS', 6)))
+BACKOFF = float(os.getenv('OUTBOX_BACKOFF', 30))
+POLL_INTERVAL = float(os.getenv('OUTBOX_POLL_INTERVAL', 5))
+
+# Longest retry delay, whatever the attempt number
+MAX_BACKOFF = 60 * 60
+# How long a claimed message is reserved for its sender (above the HTTP timeout)
+LEASE = 120
+
+# Delivery function: message -> (success, error message)
+Sender = Callable[[ContactMessage], Tuple[bool, Optional[str]]]
+
+_lock = threading.Lock()
+# Autocommit mode: transactions are opened explicitly where needed
+_db = ProcessConnection(OUTBOX_PATH, """
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        message TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt REAL NOT NULL,
+        created REAL NOT NULL,
+        sent_at REAL,
+        last_error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt);
+""", autocommit=True)
+
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _connect() -> sqlite3.Connection:
+    """Open (or reuse) the outbox database for the current process."""
+    return _db.get()
+
+
+def enqueue(msg: ContactMessage, quarantine: bool = False) -> Optional[int]:
+    """
+    Store a message for delivery and wake the delivery thread.
+
+    Args:
+        quarantine: Hold the message for review instead of sending it.
+
+    Returns:
+        The outbox id, or None if the message could not be stored.
+    """
+    now = time.time()
+    try:
+        with _lock:
+            cursor = _connect().execute(
+                'INSERT INTO outbox (name, email, message, status, next_attempt, created) VALUES (?, ?, ?, ?, ?, ?)',
+                (msg.name, msg.email, msg.message, 'quarantined' if quarantine else 'pending', now, now)
+            )
+    except (OSError, sqlite3.Error) as e:
+        print(f"[outbox] Cannot store message from {msg.email}: {e}")
+        return None
+    if not quarantine:
+        _wake.set()
+    return cursor.lastrowid
+
+
+def backoff(attempts: int) -> float:
+    """Retry delay after a given number of failed attempts (jittered)."""
+    delay = min(MAX_BACKOFF, BACKOFF * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim(limit: int) -> List[Tuple[int, int, ContactMessage]]:
+    """
+    Reserve up to limit due messages for this process.
+
+    Returns:
+        (id, attempt number, message) for each claimed message.
+    """
+    now = time.time()
+    with _lock:
+        conn = _connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                "SELECT id, attempts, name, email, message FROM outbox "
+                "WHERE status = 'pending' AND next_attempt <= ? ORDER BY next_attempt LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE outbox SET attempts = attempts + 1, next_attempt = ? WHERE id = ?',
+                [(now + LEASE, row[0]) for row in rows]
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+    return [(id_, attempts + 1, ContactMessage(name, email, message))
+            for id_, attempts, name, email, message in rows]
+
+
+def _record(id_: int, attempt: int, error: Optional[str]) -> None:
+    """Mark a message sent, schedule its retry, or dead-letter it."""
+    now = time.time()
+    with _lock:
+        conn = _connect()
+        if error is None:
+            conn.execute("UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?", (now, id_))
+        elif attempt >= MAX_ATTEMPTS:
+            conn.execute("UPDATE outbox SET status = 'dead', last_error = ? WHERE id = ?", (error, id_))
+            print(f"[outbox] Message {id_} dead-lettered after {attempt} attempts: {error}")
+        else:
+            conn.execute('UPDATE outbox SET next_attempt = ?, last_error = ? WHERE id = ?',
+                         (now + backoff(attempt), error, id_))
+            print(f"[outbox] Message {id_} failed (attempt {attempt}/{MAX_ATTEMPTS}): {error}")
+
+
+def _send(send: Sender, msg: ContactMessage) -> Optional[str]:
+    try:
+        success, error = send(msg)
+    except Exception as e:
+        return str(e) or type(e).__name__
+    return None if success else (error or 'unknown error')
+
+
+def deliver_due(send: Sender = send_contact_email, pool: Optional[ThreadPoolExecutor] = None) -> int:
+    """
+    Send one batch of due messages (at most CONCURRENCY at a time).
+
+    Returns:
+        Number of messages attempted.
+    """
+    batch = claim(CONCURRENCY)
+    if not batch:
+        return 0
+
+    if pool is None:
+        errors = [_send(send, msg) for _, _, msg in batch]
+    else:
+        errors = list(pool.map(lambda msg: _send(send, msg), [msg for _, _, msg in batch]))
+
+    for (id_, attempt, _), error in zip(batch, errors):
+        _record(id_, attempt, error)
+    return len(batch)
+
+
+def _run() -> None:
+    with ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix='outbox-send') as pool:
+        while not _stop.is_set():
+            try:
+                # A full batch means more may be due: go again right away
+                if deliver_due(pool=pool) == CONCURRENCY:
+                    continue
+            except (OSError, sqlite3.Error) as e:
+                print(f"[outbox] Delivery error: {e}")
+            _wake.wait(POLL_INTERVAL)
+            _wake.clear()
+
+
+def start_worker() -> threading.Thread:
+    """Start the delivery thread (idempotent per process)."""
+    global _thread
+
+    if _thread is not None and _thread.is_alive():
+        return _thread
+
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name='outbox-delivery', daemon=True)
+    _thread.start()
+    print(f"[outbox] Delivering from {OUTBOX_PATH} ({CONCURRENCY} concurrent sends)")
+    return _thread
+
+
+def stop_worker() -> None:
+    """Stop the delivery thread after its current batch."""
+    _stop.set()
+    _wake.set()
+    if _thread is not None and _thread is not threading.current_thread():
+        _thread.join(timeout=1)
+
+
+def counts() -> Dict[str, int]:
+    """Number of messages per status ('pending', 'sent', 'dead', 'quarantined')."""
+    with _lock:
+        rows = _connect().execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall()
+    return dict(rows)
+
+
+def retry_dead() -> int:
+    """Queue every dead-lettered message again with a fresh attempt budget."""
+    with _lock:
+        cursor = _connect().execute(
+            "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt = ? WHERE status = 'dead'",
+            (time.time(),)
+        )
+    _wake.set()
+    return cursor.rowcount
+
+
+def release_quarantined() -> int:
+    """Send every quarantined message (after reviewing them)."""
+    with _lock:
+        cursor = _connect().execute(
+            "UPDATE outbox SET status = 'pending', next_attempt = ? WHERE status = 'quarantined'",
+            (time.time(),)
+        )
+    _wake.set()
+    return cursor.rowcount
+
+
+def quarantined() -> List[Tuple[int, ContactMessage]]:
+    """Quarantined messages, oldest first."""
+    with _lock:
+        rows = _connect().execute(
+            "SELECT id, name, email, message FROM outbox WHERE status = 'quarantined' ORDER BY id"
+        ).fetchall()
+    return [(id_, ContactMessage(name, email, message)) for id_, name, email, message in rows]
+
+
+atexit.register(stop_worker)
@@ -0,0 +1,138 @@
+"""
+In-process full-page response cache.
+
+Rendered GET responses are kept as encoded bytes (plus status and headers)
+in a bounded LRU, keyed by (path + query, resolved language, content
+version), so repeated hits on the same page (including the Docker
+HEALTHCHECK on /) copy bytes instead of rebuilding and serialising the
+whole FT tree.
+
+The content version is bumped whenever the content stores swap in new
+data or the locale files change (see data/watcher.py), which drops every
+cached page.
+
+Settings (.env):
+    PAGE_CACHE=false               # Disable the cache
+    PAGE_CACHE_MAX_BYTES=33554432  # Total size of cached bodies (32 MB)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from data.content_store import subscribe
+from services.i18n import get_language
+
+CACHE_ENABLED = os.getenv('PAGE_CACHE', 'true').lower() != 'false'
+MAX_BYTES = int(os.getenv('PAGE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# Paths that are never cached (streamed files, form posts, ...)
+BYPASS_PREFIXES = ('/static/',)
+
+CacheKey = Tuple[str, str, int]
+CachedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class PageCache:
+    """Bounded LRU of encoded responses with a total byte-size limit."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.version = 0
+        self._entries: 'OrderedDict[CacheKey, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        body_size = len(entry[2])
+        if body_size > self.max_bytes:
+            return
+        with self._lock:
+            if key[2] != self.version:
+                # Rendered before an invalidation: already stale
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[2])
+            self._entries[key] = entry
+            self.size += body_size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted[2])
+
+    def invalidate(self) -> None:
+        """Drop every entry and move to a new content version."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'bytes': self.size, 'version': self.version}
+
+
+page_cache = PageCache()
+
+# Any content or locale change invalidates every rendered page
+subscribe(lambda kind, lang: page_cache.invalidate())
+
+
+class PageCacheMiddleware:
+    """
+    ASGI middleware serving cached GET responses.
+
+    Must run inside LanguageMiddleware so the language is already resolved.
+    Only complete, non-streamed 200/404 responses without Set-Cookie are
+    stored; HTMX fragment requests bypass the cache.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (not CACHE_ENABLED or scope['type'] != 'http' or scope['method'] != 'GET'
+                or scope['path'].startswith(BYPASS_PREFIXES)
+                or any(name == b'hx-request' for name, _ in scope['headers'])):
+            return await self.app(scope, receive, send)
+
+        query = scope.get('query_string', b'').decode('latin-1')
+        path = f"{scope['path']}?{query}" if query else scope['path']
+        key = (path, get_language(), page_cache.version)
+
+        cached = page_cache.get(key)
+        if cached is not None:
+            status, headers, body = cached
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+
+        start: Dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body', False) and _cacheable(start, len(chunks)):
+                    page_cache.put(key, (start['status'], list(start.get('headers', [])), b''.join(chunks)))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+
+def _cacheable(start: Dict, chunk_count: int) -> bool:
+    if start.get('status') not in (200, 404) or chunk_count != 1:
+        return False
+    headers = start.get('headers', [])
+    if any(name.lower() == b'set-cookie' for name, _ in headers):
+        return False
+    return any(name.lower() == b'content-type' and value.startswith(b'text/html') for name, value in headers)
@@ -0,0 +1,202 @@
+"""
+Token-bucket rate limiting for POST /contact.
+
+Each submission takes one token from the bucket of its client IP and one
+from the bucket of its email address; a bucket holds up to `burst` tokens
+and refills continuously at burst/period. A submission is only accepted
+(and its tokens taken) when every bucket has a token, otherwise the caller
+gets the number of seconds until it would be accepted (for Retry-After).
+
+Two backends:
+- 'sqlite' (default): buckets live in a SQLite database (WAL mode) and are
+  updated inside an IMMEDIATE transaction, so the limits hold across all
+  gunicorn workers of the host.
+- 'memory': per-process dict, for a single worker or development.
+
+The client IP is request.client.host: behind a reverse proxy, uvicorn
+resolves it from X-Forwarded-For for the addresses in --forwarded-allow-ips
+(set in the Dockerfile for Traefik) or FORWARDED_ALLOW_IPS, instead of
+trusting the header here. Otherwise every request has the proxy's address
+and the per-IP limit becomes a site-wide one.
+
+Settings (.env):
+    RATE_LIMIT=false                          # Disable rate limiting
+    RATE_LIMIT_BACKEND=memory                 # 'sqlite' (shared) or 'memory'
+    RATE_LIMIT_PATH=/app/var/ratelimit.sqlite3
+    CONTACT_RATE_IP=5/600                     # Burst / period in seconds per client IP
+    CONTACT_RATE_EMAIL=3/3600                 # Burst / period in seconds per email address
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from data.database import ProcessConnection
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT', 'true').lower() != 'false'
+BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'sqlite').lower()
+RATE_LIMIT_PATH = Path(os.getenv('RATE_LIMIT_PATH', BASE_DIR / 'var' / 'ratelimit.sqlite3'))
+
+# Buckets kept by the memory backend before full (idle) ones are dropped
+MAX_MEMORY_BUCKETS = 10_000
+
+
+@dataclass(frozen=True)
+class Limit:
+    name: str
+    burst: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self.burst / self.period
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> 'Limit':
+        """'5/600' -> 5 requests, refilled over 600 seconds."""
+        burst, period = spec.split('/')
+        return cls(name, max(1, int(burst)), max(1.0, float(period)))
+
+
+CONTACT_LIMITS = {
+    'ip': Limit.parse('ip', os.getenv('CONTACT_RATE_IP', '5/600')),
+    'email': Limit.parse('email', os.getenv('CONTACT_RATE_EMAIL', '3/3600')),
+}
+
+# (bucket key, limit) pairs checked together
+Buckets = List[Tuple[str, Limit]]
+
+
+def _refill(tokens: float, updated: float, limit: Limit, now: float) -> float:
+    return min(limit.burst, tokens + (now - updated) * limit.rate)
+
+
+def _decide(states: List[Tuple[float, Limit]]) -> float:
+    """0 if every bucket has a token, else seconds until they all do."""
+    return max((0.0 if tokens >= 1 else (1 - tokens) / limit.rate) for tokens, limit in states)
+
+
+class MemoryBackend:
+    """Buckets in a per-process dict."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, buckets: Buckets, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        with self._lock:
+            states = []
+            for key, limit in buckets:
+                tokens, updated = self._buckets.get(key, (limit.burst, now))
+                states.append((_refill(tokens, updated, limit, now), limit))
+            wait = _decide(states)
+            if wait == 0:
+                for (key, _), (tokens, _) in zip(buckets, states):
+                    self._buckets[key] = (tokens - 1, now)
+                if len(self._buckets) > MAX_MEMORY_BUCKETS:
+                    self._prune(now)
+            return wait
+
+    def _prune(self, now: float) -> None:
+        # Without its limit a bucket cannot be refilled exactly: drop the
+        # ones idle for longer than the slowest period
+        horizon = now - max(limit.period for limit in CONTACT_LIMITS.values())
+        self._buckets = {key: state for key, state in self._buckets.items() if state[1] > horizon}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBackend:
+    """Buckets in a SQLite database shared by every worker process."""
+
+    def __init__(self, path: Path = RATE_LIMIT_PATH):
+        self.path = path
+        self._db = ProcessConnection(path, """
+            CREATE TABLE IF NOT EXISTS buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL,
+                expires REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_expires ON buckets (expires);
+        """, autocommit=True)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def acquire(self, buckets: Buckets, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                states = []
+                for key, limit in buckets:
+                    row = conn.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+                    tokens, updated = row if row else (limit.burst, now)
+                    states.append((_refill(tokens, updated, limit, now), limit))
+                wait = _decide(states)
+                if wait == 0:
+                    # A bucket is full again (same as missing) one period after its last use
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO buckets (key, tokens, updated, expires) VALUES (?, ?, ?, ?)',
+                        [(key, tokens - 1, now, now + limit.period)
+                         for (key, _), (tokens, limit) in zip(buckets, states)]
+                    )
+                    conn.execute('DELETE FROM buckets WHERE expires < ?', (now,))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._connect().execute('DELETE FROM buckets')
+
+
+_backend = None
+
+
+def get_backend():
+    """The configured backend (created on first use)."""
+    global _backend
+    if _backend is None:
+        _backend = SQLiteBackend() if BACKEND == 'sqlite' else MemoryBackend()
+    return _backend
+
+
+def acquire(buckets: Buckets) -> float:
+    """
+    Take one token from every bucket, or none of them.
+
+    Returns:
+        0 when allowed, else seconds until the request would be allowed.
+    """
+    global _backend
+    if not RATE_LIMIT_ENABLED:
+        return 0.0
+    try:
+        return get_backend().acquire(buckets)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[rate_limit] Shared backend unavailable, using per-process limits: {e}")
+        _backend = MemoryBackend()
+        return _backend.acquire(buckets)
+
+
+def check_contact(client_ip: Optional[str], email: str) -> float:
+    """Rate limit a contact submission; returns seconds to wait (0 if allowed)."""
+    return acquire([
+        (f"ip:{client_ip or 'unknown'}", CONTACT_LIMITS['ip']),
+        (f"email:{email.strip().lower()}", CONTACT_LIMITS['email']),
+    ])
@@ -0,0 +1,148 @@
+"""
+Spam filtering for the contact form.
+
+Submissions go through three layers, cheapest first, before they reach
+the email outbox:
+
+1. Honeypot: a text field hidden off-screen in components/contact.Contact
+   that people never fill in but form-filling bots do.
+2. Fill time: the form posts the milliseconds since the page loaded;
+   submissions without it (no JS) or faster than SPAM_MIN_FILL_SECONDS
+   are bots.
+3. Classifier: a multinomial naive-Bayes model trained at startup from
+   data/spam_corpus.py (plus fixed keyword weights and link / ALL-CAPS /
+   non-Latin script features). Scoring a message is a few dict lookups.
+
+The verdict is 'ham' (deliver), 'quarantine' (kept in the outbox but not
+sent, see `python manage.py outbox`) or 'reject' (dropped). Only the
+honeypot and fill time reject: a classifier hit, whatever its score, is
+quarantined so a false positive can still be released.
+
+Settings (.env):
+    SPAM_FILTER=false              # Accept every submission
+    SPAM_MIN_FILL_SECONDS=3        # Faster submissions are rejected
+    SPAM_QUARANTINE=0.8            # Spam probability to hold a message
+"""
+
+import os
+import re
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from data import spam_corpus
+from data.search import fold
+
+SPAM_FILTER_ENABLED = os.getenv('SPAM_FILTER', 'true').lower() != 'false'
+MIN_FILL_SECONDS = float(os.getenv('SPAM_MIN_FILL_SECONDS', 3))
+QUARANTINE_THRESHOLD = float(os.getenv('SPAM_QUARANTINE', 0.8))
+
+# Log-odds added per keyword hit
+KEYWORD_WEIGHT = 3.0
+# Occurrences of one token that count towards the score
+MAX_TOKEN_COUNT = 3
+
+_WORD_RE = re.compile(r'[a-z0-9$]{2,}')
+_URL_RE = re.compile(r'https?://|www\.', re.I)
+_EMAIL_RE = re.compile(r'\S+@\S+\.\w+')
+_CAPS_RE = re.compile(r'\b[A-Z]{4,}\b')
+_MONEY_RE = re.compile(r'[$€£]\s?\d|\d\s?(usd|dolares|dollars)\b', re.I)
+_NON_LATIN_RE = re.compile(r'[Ѐ-ӿ֐-ۿ฀-๿぀-ヿ一-鿿]')
+
+
+def tokens(text: str) -> List[str]:
+    """Folded words plus pseudo-tokens for links, emails, money, caps and non-Latin script."""
+    words = _WORD_RE.findall(fold(text))
+    urls = len(_URL_RE.findall(text))
+    words += ['__url__'] * urls
+    if urls > 1:
+        words.append('__many_urls__')
+    words += ['__email__'] * len(_EMAIL_RE.findall(text))
+    words += ['__caps__'] * len(_CAPS_RE.findall(text))
+    if _MONEY_RE.search(text):
+        words.append('__money__')
+    if _NON_LATIN_RE.search(text):
+        words.append('__non_latin__')
+    return words
+
+
+@dataclass
+class SpamModel:
+    # token -> log P(token | spam) - log P(token | ham)
+    weights: Dict[str, float] = field(default_factory=dict)
+    prior: float = 0.0
+    # Whole-word/phrase keyword matcher on folded text
+    keywords: Optional[re.Pattern] = None
+
+    def score(self, text: str) -> float:
+        """Spam log-odds of a text."""
+        counts: Dict[str, int] = {}
+        for token in tokens(text):
+            counts[token] = counts.get(token, 0) + 1
+        log_odds = self.prior + sum(self.weights.get(token, 0.0) * min(count, MAX_TOKEN_COUNT)
+                                    for token, count in counts.items())
+        if self.keywords is not None:
+            log_odds += KEYWORD_WEIGHT * len(self.keywords.findall(fold(text)))
+        return log_odds
+
+    def probability(self, text: str) -> float:
+        """Spam probability of a text (0..1)."""
+        log_odds = max(-50.0, min(50.0, self.score(text)))
+        return 1 / (1 + math.exp(-log_odds))
+
+
+def train(spam: List[str], ham: List[str], keywords: Optional[List[str]] = None) -> SpamModel:
+    """Fit a multinomial naive-Bayes model with Laplace smoothing."""
+    counts = {'spam': {}, 'ham': {}}
+    for label, texts in (('spam', spam), ('ham', ham)):
+        for text in texts:
+            for token in tokens(text):
+                counts[label][token] = counts[label].get(token, 0) + 1
+
+    vocabulary = set(counts['spam']) | set(counts['ham'])
+    totals = {label: sum(c.values()) + len(vocabulary) for label, c in counts.items()}
+    weights = {
+        token: math.log((counts['spam'].get(token, 0) + 1) / totals['spam'])
+        - math.log((counts['ham'].get(token, 0) + 1) / totals['ham'])
+        for token in vocabulary
+    }
+    pattern = (re.compile(r'\b(?:' + '|'.join(re.escape(fold(k)) for k in keywords) + r')\b')
+               if keywords else None)
+    # Contact messages are mostly legitimate: start from even odds, not the corpus ratio
+    return SpamModel(weights=weights, prior=0.0, keywords=pattern)
+
+
+_model: Optional[SpamModel] = None
+_lock = threading.Lock()
+
+
+def get_model() -> SpamModel:
+    """Model trained from data/spam_corpus.py (once per process)."""
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                _model = train(spam_corpus.SPAM, spam_corpus.HAM, spam_corpus.KEYWORDS)
+    return _model
+
+
+def classify(name: str, message: str, honeypot: str = '', elapsed_ms: Optional[float] = None) -> str:
+    """
+    Verdict for a contact submission: 'ham', 'quarantine' or 'reject'.
+
+    Args:
+        honeypot: Value of the hidden field (must be empty).
+        elapsed_ms: Milliseconds between page load and submit (None if missing).
+    """
+    if not SPAM_FILTER_ENABLED:
+        return 'ham'
+    if honeypot:
+        return 'reject'
+    if elapsed_ms is None or elapsed_ms < MIN_FILL_SECONDS * 1000:
+        return 'reject'
+
+    probability = get_model().probability(f'{name}\n{message}')
+    if probability >= QUARANTINE_THRESHOLD:
+        return 'quarantine'
+    return 'ham'